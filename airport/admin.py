@@ -6,8 +6,16 @@ from airport.models import (
     Airport,
     Route,
     Crew,
-    Flight
+    Flight,
+    FlightSchedule
 )
+from api.pagination import EstimatedCountPaginator
+
+
+class EstimatedCountAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # the full count is another COUNT(*) of the whole table
+    show_full_result_count = False
 
 
 admin.site.register(AirplaneType)
@@ -15,4 +23,5 @@ admin.site.register(Airplane)
 admin.site.register(Airport)
 admin.site.register(Route)
 admin.site.register(Crew)
-admin.site.register(Flight)
+admin.site.register(Flight, EstimatedCountAdmin)
+admin.site.register(FlightSchedule)
@@ -0,0 +1,442 @@
+import csv
+import io
+import itertools
+import json
+import time
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.models import (
+    AirplaneType,
+    Airplane,
+    Airport,
+    Route,
+    Crew,
+    Flight
+)
+
+
+def read_rows(path):
+    """Dicts from a .csv file with a header or from a NDJSON file"""
+    with open(path, newline="") as file:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batches(rows, size):
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+def text(value, max_length):
+    value = str(value or "").strip()
+    if not value or len(value) > max_length:
+        raise ValueError(f"must be 1-{max_length} characters")
+    return value
+
+
+def positive(value):
+    value = int(value)
+    if value < 1:
+        raise ValueError("must be positive")
+    return value
+
+
+def moment(value):
+    value = parse_datetime(str(value))
+    if value is None:
+        raise ValueError("must be an ISO 8601 datetime")
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+class Loader:
+    """
+    Writes rows of column values, through COPY on PostgreSQL
+    and bulk_create/bulk_update on other backends
+    """
+
+    def __init__(self, model, columns, defaults=None):
+        self.model = model
+        self.columns = columns
+        self.defaults = defaults or {}
+        self.table = model._meta.db_table
+        self.copy = connection.vendor == "postgresql"
+
+    @staticmethod
+    def csv_buffer(rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [
+                r"\N" if value is None else value
+                for value in row
+            ]
+            for row in rows
+        )
+        buffer.seek(0)
+        return buffer
+
+    def copy_into(self, cursor, table, columns, rows):
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            self.csv_buffer(rows)
+        )
+
+    def staged(self, cursor, columns, rows):
+        staging = f"import_{self.table}"
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {', '.join(columns)} FROM {self.table} WITH NO DATA"
+        )
+        self.copy_into(cursor, staging, columns, rows)
+        return staging
+
+    def insert(self, rows):
+        """Inserts rows, filling columns missing from them with defaults"""
+        if not rows:
+            return
+        columns = (*self.columns, *self.defaults)
+        rows = [(*row, *self.defaults.values()) for row in rows]
+        if not self.copy:
+            self.model.objects.bulk_create(
+                self.model(**dict(zip(columns, row))) for row in rows
+            )
+            return
+        with connection.cursor() as cursor:
+            self.copy_into(cursor.cursor, self.table, columns, rows)
+
+    def insert_missing(self, rows):
+        """Inserts rows that do not break a unique constraint"""
+        if not rows:
+            return
+        if not self.copy:
+            self.model.objects.bulk_create(
+                (self.model(**dict(zip(self.columns, row))) for row in rows),
+                ignore_conflicts=True
+            )
+            return
+        columns = ", ".join(self.columns)
+        with connection.cursor() as cursor:
+            staging = self.staged(cursor.cursor, self.columns, rows)
+            cursor.execute(
+                f"INSERT INTO {self.table} ({columns}) "
+                f"SELECT {columns} FROM {staging} ON CONFLICT DO NOTHING"
+            )
+            cursor.execute(f"DROP TABLE {staging}")
+
+    def update(self, rows):
+        """Rows start with the primary key followed by the columns"""
+        if not rows:
+            return
+        if not self.copy:
+            self.model.objects.bulk_update(
+                [
+                    self.model(id=row[0], **dict(zip(self.columns, row[1:])))
+                    for row in rows
+                ],
+                self.columns
+            )
+            return
+        with connection.cursor() as cursor:
+            staging = self.staged(cursor.cursor, ("id", *self.columns), rows)
+            cursor.execute(
+                f"UPDATE {self.table} AS target SET "
+                + ", ".join(
+                    f"{column} = staging.{column}" for column in self.columns
+                )
+                + f" FROM {staging} AS staging WHERE target.id = staging.id"
+            )
+            cursor.execute(f"DROP TABLE {staging}")
+
+
+class Importer:
+    """
+    Upserts one model from a file by natural key: new keys are inserted,
+    known keys with changed values are updated, the rest is skipped, so
+    importing the same file again writes nothing
+    """
+
+    model = None
+    columns = ()
+    defaults = None
+    max_errors = 10
+
+    def __init__(self, stdout, batch_size=10000):
+        self.stdout = stdout
+        self.batch_size = batch_size
+        self.read = self.inserted = self.updated = self.rejected = 0
+        self.errors = []
+
+    def existing(self):
+        """Natural key -> (id, column values) of rows already stored"""
+        raise NotImplementedError
+
+    def clean(self, row):
+        """Natural key and column values of a file row, or ValueError"""
+        raise NotImplementedError
+
+    def clean_batch(self, batch, first_line):
+        cleaned = {}
+        for line, row in enumerate(batch, first_line):
+            try:
+                key, values = self.clean(row)
+            except (KeyError, TypeError, ValueError) as error:
+                self.rejected += 1
+                if len(self.errors) < self.max_errors:
+                    self.errors.append(f"line {line}: {error!r}")
+                continue
+            cleaned[key] = values
+        return cleaned
+
+    def run(self, path):
+        started = time.monotonic()
+        stored = self.existing()
+        loader = Loader(self.model, self.columns, self.defaults)
+        rows = read_rows(path)
+
+        for number, batch in enumerate(batches(rows, self.batch_size)):
+            cleaned = self.clean_batch(batch, number * self.batch_size + 1)
+            new = {
+                key: values
+                for key, values in cleaned.items()
+                if key not in stored
+            }
+            changed = [
+                (stored[key][0], *values)
+                for key, values in cleaned.items()
+                if key in stored
+                and stored[key][0] is not None
+                and stored[key][1] != values
+            ]
+
+            with transaction.atomic():
+                loader.insert(list(new.values()))
+                loader.update(changed)
+
+            stored.update((key, (None, values)) for key, values in new.items())
+            self.read += len(batch)
+            self.inserted += len(new)
+            self.updated += len(changed)
+            self.report(started, final=False)
+
+        self.after_import()
+        self.report(started, final=True)
+
+    def after_import(self):
+        pass
+
+    def report(self, started, final):
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"{self.model._meta.verbose_name_plural}: "
+            f"{self.read} read, {self.inserted} inserted, "
+            f"{self.updated} updated, {self.rejected} rejected "
+            f"in {elapsed:.1f}s "
+            f"({self.read / max(elapsed, 1e-6):.0f} rows/s)"
+            + ("" if final else "..."),
+            ending="\n" if final else "\r"
+        )
+        if final:
+            for error in self.errors:
+                self.stdout.write(f"  {error}")
+
+
+class AirportImporter(Importer):
+    model = Airport
+    columns = ("name", "closest_big_city")
+
+    def existing(self):
+        return {
+            name: (pk, (name, city))
+            for pk, name, city in Airport.objects.values_list(
+                "id", "name", "closest_big_city"
+            )
+        }
+
+    def clean(self, row):
+        name = text(row["name"], 30)
+        return name, (name, text(row["closest_big_city"], 15))
+
+
+class AirplaneImporter(Importer):
+    model = Airplane
+    columns = ("name", "rows", "seats_in_row", "airplane_type_id")
+
+    def existing(self):
+        self.airplane_types = dict(
+            AirplaneType.objects.values_list("name", "id")
+        )
+        return {
+            values[0]: (pk, values)
+            for pk, *values in Airplane.objects.values_list(
+                "id", *self.columns
+            ).order_by()
+            for values in [tuple(values)]
+        }
+
+    def clean_batch(self, batch, first_line):
+        missing_types = {
+            str(row.get("airplane_type") or "").strip()
+            for row in batch
+        } - set(self.airplane_types)
+        missing_types = [name for name in missing_types if 0 < len(name) <= 30]
+        if missing_types:
+            AirplaneType.objects.bulk_create(
+                (AirplaneType(name=name) for name in missing_types),
+                ignore_conflicts=True
+            )
+            self.airplane_types = dict(
+                AirplaneType.objects.values_list("name", "id")
+            )
+        return super().clean_batch(batch, first_line)
+
+    def clean(self, row):
+        name = text(row["name"], 30)
+        return name, (
+            name,
+            positive(row["rows"]),
+            positive(row["seats_in_row"]),
+            self.airplane_types[text(row["airplane_type"], 30)],
+        )
+
+
+class RouteImporter(Importer):
+    model = Route
+    columns = ("source_id", "destination_id", "distance")
+
+    def existing(self):
+        self.airports = dict(Airport.objects.values_list("name", "id"))
+        return {
+            values[:2]: (pk, values)
+            for pk, *values in Route.objects.values_list(
+                "id", *self.columns
+            ).order_by()
+            for values in [tuple(values)]
+        }
+
+    def clean(self, row):
+        source = self.airports[row["source"]]
+        destination = self.airports[row["destination"]]
+        Route.validate_source_destination(source, destination, ValueError)
+        return (source, destination), (
+            source,
+            destination,
+            positive(row["distance"]),
+        )
+
+
+class CrewImporter(Importer):
+    model = Crew
+    columns = ("first_name", "last_name")
+
+    def existing(self):
+        return {
+            values: (pk, values)
+            for pk, *values in Crew.objects.values_list(
+                "id", *self.columns
+            ).order_by()
+            for values in [tuple(values)]
+        }
+
+    def clean(self, row):
+        values = (text(row["first_name"], 20), text(row["last_name"], 20))
+        return values, values
+
+
+class FlightImporter(Importer):
+    """
+    Flights are keyed by route and departure time, crews are given
+    as a list (";"-separated in CSV) of "first_name last_name" and
+    only added to the crews a flight already has
+    """
+
+    model = Flight
+    columns = ("route_id", "airplane_id", "departure_time", "arrival_time")
+    # tickets_sold is kept by bookings and never overwritten by imports
+    defaults = {"tickets_sold": 0, "tickets_version": 0}
+
+    def existing(self):
+        self.airports = dict(Airport.objects.values_list("name", "id"))
+        self.airplanes = dict(Airplane.objects.values_list("name", "id"))
+        self.routes = {
+            (source, destination): pk
+            for pk, source, destination in Route.objects.values_list(
+                "id", "source_id", "destination_id"
+            ).order_by()
+        }
+        self.crews = {
+            f"{first_name} {last_name}": pk
+            for pk, first_name, last_name in Crew.objects.values_list(
+                "id", "first_name", "last_name"
+            ).order_by()
+        }
+        self.flight_crews = {}
+        return {
+            (values[0], values[2]): (pk, values)
+            for pk, *values in Flight.objects.values_list(
+                "id", *self.columns
+            ).order_by()
+            for values in [tuple(values)]
+        }
+
+    def clean(self, row):
+        route = self.routes[
+            (self.airports[row["source"]], self.airports[row["destination"]])
+        ]
+        departure_time = moment(row["departure_time"])
+        arrival_time = moment(row["arrival_time"])
+        if arrival_time <= departure_time:
+            raise ValueError("arrival_time must be after departure_time")
+
+        crews = row.get("crews") or []
+        if isinstance(crews, str):
+            crews = crews.split(";")
+        crews = {self.crews[crew.strip()] for crew in crews if crew.strip()}
+        if crews:
+            self.flight_crews[(route, departure_time)] = crews
+
+        return (route, departure_time), (
+            route,
+            self.airplanes[row["airplane"]],
+            departure_time,
+            arrival_time,
+        )
+
+    def after_import(self):
+        if not self.flight_crews:
+            return
+        flights = {
+            (route, departure_time): pk
+            for pk, route, departure_time in Flight.objects.filter(
+                departure_time__gte=min(key[1] for key in self.flight_crews),
+                departure_time__lte=max(key[1] for key in self.flight_crews),
+            ).values_list("id", "route_id", "departure_time").order_by()
+        }
+        loader = Loader(Flight.crews.through, ("flight_id", "crew_id"))
+        rows = (
+            (flights[key], crew)
+            for key, crews in self.flight_crews.items()
+            if key in flights
+            for crew in crews
+        )
+        for batch in batches(rows, self.batch_size):
+            with transaction.atomic():
+                loader.insert_missing(batch)
+
+
+IMPORTERS = {
+    "airports": AirportImporter,
+    "airplanes": AirplaneImporter,
+    "routes": RouteImporter,
+    "crews": CrewImporter,
+    "flights": FlightImporter,
+}
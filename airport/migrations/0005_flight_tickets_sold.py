@@ -0,0 +1,35 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tickets_sold(apps, schema_editor):
+    Flight = apps.get_model("airport", "Flight")
+    Ticket = apps.get_model("cart", "Ticket")
+
+    sold = (
+        Ticket.objects.filter(flight=OuterRef("pk"))
+        .order_by()
+        .values("flight")
+        .annotate(sold=Count("pk"))
+        .values("sold")
+    )
+    Flight.objects.update(tickets_sold=Coalesce(Subquery(sold), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0004_alter_airplane_options_alter_airplanetype_options_and_more"),
+        ("cart", "0002_alter_order_options_alter_ticket_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_tickets_sold, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:48
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0005_flight_tickets_sold"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="airport",
+            index=models.Index(
+                django.db.models.functions.text.Upper("closest_big_city"),
+                name="airport_closest_city_upper",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["departure_time", "id"], name="airport_fli_departu_5be25a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="route",
+            index=models.Index(
+                fields=["source", "destination"], name="airport_rou_source__5c8f4c_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.4 on 2026-10-18 20:24
+
+import airport.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0006_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightSchedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "weekdays",
+                    models.CharField(
+                        help_text="ISO weekdays the flight operates, ex. 135 for Monday, Wednesday and Friday",
+                        max_length=7,
+                        validators=[airport.models.validate_weekdays],
+                    ),
+                ),
+                ("departure_time", models.TimeField(help_text="Local time")),
+                (
+                    "arrival_time",
+                    models.TimeField(
+                        help_text="Local time, earlier than departure for overnight flights"
+                    ),
+                ),
+                ("valid_from", models.DateField()),
+                ("valid_until", models.DateField()),
+                (
+                    "generated_until",
+                    models.DateField(
+                        blank=True,
+                        editable=False,
+                        help_text="Last day flights are already generated for",
+                        null=True,
+                    ),
+                ),
+                (
+                    "airplane",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedules",
+                        to="airport.airplane",
+                    ),
+                ),
+                (
+                    "crews",
+                    models.ManyToManyField(
+                        blank=True, related_name="schedules", to="airport.crew"
+                    ),
+                ),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedules",
+                        to="airport.route",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["route", "departure_time"],
+            },
+        ),
+    ]
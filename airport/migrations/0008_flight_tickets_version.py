@@ -0,0 +1,17 @@
+# Generated by Django 4.2.4 on 2026-10-18 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("airport", "0007_flightschedule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="tickets_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
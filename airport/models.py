@@ -1,5 +1,7 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Upper
 
 
 class AirplaneType(models.Model):
@@ -39,6 +41,12 @@ class Airport(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(
+                Upper("closest_big_city"),
+                name="airport_closest_city_upper"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -59,6 +67,9 @@ class Route(models.Model):
 
     class Meta:
         ordering = ["source"]
+        indexes = [
+            models.Index(fields=["source", "destination"]),
+        ]
 
     @staticmethod
     def validate_source_destination(source, destination, error_to_raise):
@@ -114,6 +125,136 @@ class Flight(models.Model):
     )
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    # only grows, every change of tickets_sold bumps it
+    tickets_version = models.PositiveBigIntegerField(
+        default=0,
+        editable=False
+    )
 
     class Meta:
         ordering = ["departure_time"]
+        indexes = [
+            models.Index(fields=["departure_time", "id"]),
+        ]
+
+    @staticmethod
+    def update_tickets_sold(sold_by_flight):
+        """
+        Shift stored tickets_sold counters, sold_by_flight maps
+        flight id to a (possibly negative) number of tickets,
+        and bump tickets_version of these flights
+        """
+        sold_by_flight = {
+            flight_id: sold
+            for flight_id, sold in sold_by_flight.items()
+            if sold
+        }
+        if not sold_by_flight:
+            return
+        Flight.objects.filter(pk__in=sold_by_flight).update(
+            tickets_sold=F("tickets_sold") + Case(
+                *(
+                    When(pk=flight_id, then=Value(sold))
+                    for flight_id, sold in sold_by_flight.items()
+                ),
+                output_field=models.IntegerField()
+            ),
+            tickets_version=F("tickets_version") + 1
+        )
+
+    def pack_places(self, taken_places) -> bytes:
+        """
+        Pack occupied seats into a bitmap of rows * seats_in_row bits.
+        Bits go row by row, most significant bit first, so the seat
+        (row, seat) is bit number (row - 1) * seats_in_row + (seat - 1).
+        Places outside the grid, sold before the airplane was replaced
+        by a smaller one, have no bit and are skipped.
+        """
+        rows, seats_in_row = self.airplane.rows, self.airplane.seats_in_row
+        bitmap = bytearray((self.airplane.capacity + 7) // 8)
+
+        for row, seat in taken_places:
+            if not (1 <= row <= rows and 1 <= seat <= seats_in_row):
+                continue
+            index = (row - 1) * seats_in_row + (seat - 1)
+            bitmap[index >> 3] |= 0x80 >> (index & 7)
+        return bytes(bitmap)
+
+    def taken_places_bitmap(self) -> bytes:
+        return self.pack_places(
+            self.tickets.order_by().values_list("row", "seat")
+        )
+
+    async def ataken_places_bitmap(self) -> bytes:
+        # values_list().aiterator() runs its query synchronously on 4.2
+        return self.pack_places(
+            [
+                (place["row"], place["seat"])
+                async for place in self.tickets.order_by().values(
+                    "row",
+                    "seat"
+                ).aiterator()
+            ]
+        )
+
+
+def validate_weekdays(value):
+    if (
+        not value
+        or not set(value) <= set("1234567")
+        or len(set(value)) != len(value)
+    ):
+        raise ValidationError(
+            "Weekdays must be distinct ISO numbers 1 (Monday) - 7 (Sunday)"
+        )
+
+
+class FlightSchedule(models.Model):
+    route = models.ForeignKey(
+        Route,
+        related_name="schedules",
+        on_delete=models.CASCADE
+    )
+    airplane = models.ForeignKey(
+        Airplane,
+        related_name="schedules",
+        on_delete=models.CASCADE
+    )
+    crews = models.ManyToManyField(
+        Crew,
+        related_name="schedules",
+        blank=True
+    )
+    weekdays = models.CharField(
+        max_length=7,
+        validators=[validate_weekdays],
+        help_text="ISO weekdays the flight operates, ex. 135 for "
+                  "Monday, Wednesday and Friday",
+    )
+    departure_time = models.TimeField(help_text="Local time")
+    arrival_time = models.TimeField(
+        help_text="Local time, earlier than departure for overnight flights"
+    )
+    valid_from = models.DateField()
+    valid_until = models.DateField()
+    generated_until = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Last day flights are already generated for",
+    )
+
+    class Meta:
+        ordering = ["route", "departure_time"]
+
+    def clean(self):
+        super().clean()
+        if self.valid_until < self.valid_from:
+            raise ValidationError(
+                {"valid_until": "Must not be earlier than valid_from"}
+            )
+        if self.arrival_time == self.departure_time:
+            raise ValidationError(
+                {"arrival_time": "Must differ from departure_time"}
+            )
@@ -0,0 +1,114 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from airport.models import Flight, FlightSchedule
+
+
+def schedule_days(schedule, until):
+    """Days left to generate, up to until and within the validity period"""
+    first = schedule.valid_from
+    if schedule.generated_until:
+        first = max(
+            first,
+            schedule.generated_until + datetime.timedelta(days=1)
+        )
+    last = min(schedule.valid_until, until)
+
+    weekdays = {int(weekday) for weekday in schedule.weekdays}
+    day = first
+    while day <= last:
+        if day.isoweekday() in weekdays:
+            yield day
+        day += datetime.timedelta(days=1)
+
+
+def schedule_times(schedule, day):
+    """Aware departure and arrival times of the flight on that day"""
+    arrival_day = day
+    if schedule.arrival_time <= schedule.departure_time:
+        arrival_day += datetime.timedelta(days=1)
+    return (
+        timezone.make_aware(
+            datetime.datetime.combine(day, schedule.departure_time)
+        ),
+        timezone.make_aware(
+            datetime.datetime.combine(arrival_day, schedule.arrival_time)
+        ),
+    )
+
+
+def expand_schedules(until, schedules=None, batch_size=2000):
+    """
+    Generates flights and their crews for every schedule day up to until
+    with bulk inserts. Flights with the same route and departure time
+    are skipped and each schedule remembers how far it was expanded, so
+    running it again as the horizon rolls forward only adds new days.
+    Returns the number of created flights.
+    """
+    if schedules is None:
+        schedules = FlightSchedule.objects.all()
+
+    with transaction.atomic():
+        schedules = list(
+            schedules.select_for_update().exclude(
+                generated_until__gte=until
+            ).exclude(
+                generated_until__gte=F("valid_until")
+            ).order_by("id").prefetch_related("crews")
+        )
+
+        flights, crews, expanded = [], [], []
+        for schedule in schedules:
+            times = [
+                schedule_times(schedule, day)
+                for day in schedule_days(schedule, until)
+            ]
+            if times:
+                existing = set(
+                    Flight.objects.filter(
+                        route_id=schedule.route_id,
+                        departure_time__gte=times[0][0],
+                        departure_time__lte=times[-1][0],
+                    ).values_list("departure_time", flat=True)
+                )
+                for departure_time, arrival_time in times:
+                    if departure_time not in existing:
+                        flights.append(
+                            Flight(
+                                route_id=schedule.route_id,
+                                airplane_id=schedule.airplane_id,
+                                departure_time=departure_time,
+                                arrival_time=arrival_time,
+                            )
+                        )
+                        crews.append(schedule.crews.all())
+
+            schedule.generated_until = min(schedule.valid_until, until)
+            expanded.append(schedule)
+
+        Flight.objects.bulk_create(flights, batch_size=batch_size)
+        if any(flight.pk is None for flight in flights):
+            # backends that can't return ids from bulk inserts
+            ids = {
+                (route, departure_time): pk
+                for pk, route, departure_time in Flight.objects.filter(
+                    route_id__in={flight.route_id for flight in flights}
+                ).values_list("id", "route_id", "departure_time")
+            }
+            for flight in flights:
+                flight.pk = ids[(flight.route_id, flight.departure_time)]
+
+        Flight.crews.through.objects.bulk_create(
+            (
+                Flight.crews.through(flight_id=flight.pk, crew_id=crew.pk)
+                for flight, flight_crews in zip(flights, crews)
+                for crew in flight_crews
+            ),
+            batch_size=batch_size
+        )
+        FlightSchedule.objects.bulk_update(expanded, ["generated_until"])
+
+    return len(flights)
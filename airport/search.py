@@ -0,0 +1,221 @@
+import bisect
+import datetime
+import threading
+import time
+from collections import defaultdict, namedtuple, OrderedDict
+
+from django.utils import timezone
+
+from airport.models import Flight, Route
+
+
+Leg = namedtuple(
+    "Leg",
+    [
+        "flight_id",
+        "source",
+        "destination",
+        "source_name",
+        "destination_name",
+        "distance",
+        "departure_time",
+        "arrival_time",
+    ]
+)
+
+
+class Itinerary:
+    def __init__(self, legs):
+        self.legs = legs
+
+    @property
+    def departure_time(self):
+        return self.legs[0].departure_time
+
+    @property
+    def arrival_time(self):
+        return self.legs[-1].arrival_time
+
+    @property
+    def duration(self):
+        return self.arrival_time - self.departure_time
+
+    @property
+    def distance(self):
+        return sum(leg.distance for leg in self.legs)
+
+
+class DayIndex:
+    """Flights departing on one day, grouped by source airport"""
+
+    def __init__(self, day):
+        start = timezone.make_aware(
+            datetime.datetime.combine(day, datetime.time.min)
+        )
+        self.departures = defaultdict(list)
+
+        legs = Flight.objects.filter(
+            departure_time__gte=start,
+            departure_time__lt=start + datetime.timedelta(days=1)
+        ).order_by(
+            "departure_time"
+        ).values_list(
+            "id",
+            "route__source_id",
+            "route__destination_id",
+            "route__source__name",
+            "route__destination__name",
+            "route__distance",
+            "departure_time",
+            "arrival_time",
+        )
+        for leg in map(Leg._make, legs):
+            self.departures[leg.source].append(leg)
+
+        self.departure_times = {
+            airport: [leg.departure_time for leg in legs]
+            for airport, legs in self.departures.items()
+        }
+
+    def legs_from(self, airport, earliest, latest):
+        times = self.departure_times.get(airport)
+        if not times:
+            return []
+        return self.departures[airport][
+            bisect.bisect_left(times, earliest):
+            bisect.bisect_right(times, latest)
+        ]
+
+
+class FlightSearchIndex:
+    """
+    In-memory adjacency index of flights, built per departure day with one
+    query and reused until it expires or flights and routes change
+    """
+
+    min_connection = datetime.timedelta(minutes=45)
+    max_layover = datetime.timedelta(hours=24)
+    ttl = 60
+    max_days = 64
+
+    def __init__(self):
+        # least recently used first
+        self.days = OrderedDict()
+        self.sources = None
+        self.routes_built_at = None
+        self.lock = threading.Lock()
+
+    def clear(self):
+        with self.lock:
+            self.days.clear()
+            self.routes_built_at = None
+
+    def day(self, day):
+        with self.lock:
+            built_at, index = self.days.get(day, (None, None))
+            if built_at is not None and time.monotonic() - built_at < self.ttl:
+                self.days.move_to_end(day)
+                return index
+
+        index = DayIndex(day)
+        with self.lock:
+            now = time.monotonic()
+            self.days[day] = (now, index)
+            self.days.move_to_end(day)
+            for expired in [
+                key
+                for key, (built_at, _) in self.days.items()
+                if now - built_at >= self.ttl
+            ]:
+                del self.days[expired]
+            while len(self.days) > self.max_days:
+                self.days.popitem(last=False)
+        return index
+
+    def legs_from(self, airport, earliest, latest):
+        day = timezone.localdate(earliest)
+        while day <= timezone.localdate(latest):
+            yield from self.day(day).legs_from(airport, earliest, latest)
+            day += datetime.timedelta(days=1)
+
+    def route_sources(self):
+        with self.lock:
+            if (
+                self.routes_built_at is not None
+                and time.monotonic() - self.routes_built_at < self.ttl
+            ):
+                return self.sources
+
+        sources = defaultdict(set)
+        for source, destination in Route.objects.order_by().values_list(
+            "source_id",
+            "destination_id"
+        ):
+            sources[destination].add(source)
+
+        with self.lock:
+            self.routes_built_at, self.sources = time.monotonic(), sources
+        return sources
+
+    def reaching(self, destination, max_legs):
+        """
+        Airports with routes to destination in at most n legs
+        for every n < max_legs, used to prune hopeless connections
+        """
+        sources = self.route_sources()
+        reaching = [{destination}]
+        for _ in range(max_legs - 1):
+            reaching.append(
+                reaching[-1].union(
+                    *(sources[airport] for airport in reaching[-1])
+                )
+            )
+        return reaching
+
+    def search(self, source, destination, date, max_legs=2, order="duration"):
+        start = timezone.make_aware(
+            datetime.datetime.combine(date, datetime.time.min)
+        )
+        end = start + datetime.timedelta(days=1)
+        reaching = self.reaching(destination, max_legs)
+
+        itineraries = []
+
+        def extend(legs, airport, earliest, latest, visited):
+            legs_left = max_legs - len(legs) - 1
+            for leg in self.legs_from(airport, earliest, latest):
+                if leg.destination == destination:
+                    itineraries.append(Itinerary(legs + [leg]))
+                elif (
+                    legs_left
+                    and leg.destination not in visited
+                    and leg.destination in reaching[legs_left]
+                ):
+                    ready_at = leg.arrival_time + self.min_connection
+                    extend(
+                        legs + [leg],
+                        leg.destination,
+                        ready_at,
+                        ready_at + self.max_layover,
+                        visited | {leg.destination}
+                    )
+
+        if source != destination:
+            extend(
+                [],
+                source,
+                start,
+                end - datetime.timedelta(microseconds=1),
+                {source}
+            )
+
+        itineraries.sort(
+            key=lambda itinerary: (
+                getattr(itinerary, order),
+                itinerary.arrival_time
+            )
+        )
+        return itineraries
+
+
+flight_search_index = FlightSearchIndex()
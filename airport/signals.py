@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from airport.models import Flight, Route
+from airport.search import flight_search_index
+
+
+@receiver([post_save, post_delete], sender=Flight)
+@receiver([post_save, post_delete], sender=Route)
+def clear_flight_search_index(sender, **kwargs):
+    flight_search_index.clear()
@@ -0,0 +1,173 @@
+import contextvars
+import random
+import time
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async
+)
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections, DEFAULT_DB_ALIAS, OperationalError
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import (
+    api_settings as jwt_settings
+)
+
+from api.authentication import CachedJWTAuthentication
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# replica alias picked for the current safe-method request
+request_replica = contextvars.ContextVar("request_replica", default=None)
+
+unavailable_until = {}
+
+
+def pin_key(user_id):
+    return f"replica_pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """Reads of the user go to the primary while replicas catch up"""
+    cache.set(pin_key(user_id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return user_id is not None and cache.get(pin_key(user_id), False)
+
+
+def available(alias):
+    """Replicas that fail to connect are skipped for a while"""
+    if unavailable_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except OperationalError:
+        unavailable_until[alias] = (
+            time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        )
+        return False
+    return True
+
+
+def pick_replica():
+    replicas = list(settings.DATABASE_REPLICAS)
+    random.shuffle(replicas)
+    for alias in replicas:
+        if available(alias):
+            return alias
+    return DEFAULT_DB_ALIAS
+
+
+class PrimaryReplicaRouter:
+    """
+    Reads of safe-method requests go to the replica picked for the request,
+    everything else, including reads inside transactions, to the primary
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = request_replica.get()
+        if (
+            replica is None
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+jwt_authentication = CachedJWTAuthentication()
+
+
+def token_user_id(request):
+    """User id claim of a valid JWT, without loading the user"""
+    header = jwt_authentication.get_header(request)
+    raw_token = header and jwt_authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        token = jwt_authentication.get_validated_token(raw_token)
+    except InvalidToken:
+        return None
+    return token.get(jwt_settings.USER_ID_CLAIM)
+
+
+def session_user_id(request):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets PrimaryReplicaRouter send reads of GET/HEAD/OPTIONS requests to
+    replicas, unless the user wrote something within REPLICA_PIN_SECONDS.
+    Not used at all without DATABASE_REPLICAS
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def pick(self, request):
+        """Replica for the reads of request, None for the primary"""
+        use_replica = (
+            request.method in SAFE_METHODS
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+            and not is_pinned(
+                token_user_id(request) or session_user_id(request)
+            )
+        )
+        return pick_replica() if use_replica else None
+
+    def pin(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # DRF views put the user they authenticated on the request
+            user_id = session_user_id(request)
+            if user_id is not None:
+                pin_to_primary(user_id)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        # connecting here keeps the check out of async views
+        token = request_replica.set(self.pick(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            request_replica.reset(token)
+
+        self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        # the cache and replica connections are sync, the view awaited
+        # in between stays on the event loop
+        token = request_replica.set(await sync_to_async(self.pick)(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_replica.reset(token)
+
+        await sync_to_async(self.pin)(request, response)
+        return response
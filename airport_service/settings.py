@@ -30,11 +30,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "airport_service.replicas.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -70,6 +72,31 @@ DATABASES = {
     }
 }
 
+# read replicas as comma separated host[:port], same name and credentials
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")),
+    start=1
+):
+    host, _, port = replica.strip().partition(":")
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{number}")
+
+DATABASE_ROUTERS = ["airport_service.replicas.PrimaryReplicaRouter"]
+
+# reads of a user stay on the primary this long after their writes
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 10))
+REPLICA_RETRY_SECONDS = 30
+
+# paginators of large tables use planner estimates of at least this
+# many rows instead of an exact COUNT(*)
+ESTIMATED_COUNT_THRESHOLD = int(os.getenv("ESTIMATED_COUNT_THRESHOLD", 10000))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -101,7 +128,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -109,11 +136,28 @@ REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.UserRateThrottle",
+        "api.throttling.SlidingWindowThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"user": "50/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "user": "50/day",
+        "search": "300/hour",
+        "booking": "20/hour",
+        "auth": "20/minute",
+    },
 }
 
+# request metrics shared by the worker processes of the host,
+# empty keeps them per process
+METRICS_SQLITE_PATH = os.getenv("METRICS_SQLITE_PATH", "")
+
+# throttle counters shared by the worker processes of the host,
+# empty keeps them in the default cache
+THROTTLE_SQLITE_PATH = os.getenv("THROTTLE_SQLITE_PATH", "")
+
+# verified tokens and their users kept by every process
+AUTH_CACHE_TIMEOUT = 60
+AUTH_CACHE_SIZE = 10_000
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": datetime.timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": datetime.timedelta(days=1),
@@ -7,9 +7,12 @@ from drf_spectacular.views import (
     SpectacularSwaggerView
 )
 
+from api.views.metrics_views import MetricsView
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path(
         "api/v1/",
         include("api.urls", namespace="api")
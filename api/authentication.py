@@ -0,0 +1,116 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import (
+    api_settings as jwt_settings
+)
+
+
+class TTLCache:
+    """Thread-safe LRU of at most maxsize entries, each with its own expiry"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def pop(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+validated_tokens = TTLCache(settings.AUTH_CACHE_SIZE)
+users = TTLCache(settings.AUTH_CACHE_SIZE)
+
+
+def user_version_key(user_id):
+    return f"auth_cache:user_version:{user_id}"
+
+
+def user_version(user_id):
+    return cache.get(user_version_key(user_id), 0)
+
+
+def invalidate_user(user_id):
+    """
+    Drops the user from this process, other processes see the bumped
+    version when they share the cache and AUTH_CACHE_TIMEOUT later if not
+    """
+    users.pop(user_id)
+    key = user_version_key(user_id)
+    if not cache.add(key, 1, timeout=settings.AUTH_CACHE_TIMEOUT):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=settings.AUTH_CACHE_TIMEOUT)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that remembers verified tokens until they expire and
+    users until they are saved, for at most AUTH_CACHE_TIMEOUT seconds,
+    so repeated requests skip the signature check and the user query
+    """
+
+    def get_validated_token(self, raw_token):
+        token = validated_tokens.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            timeout = min(
+                settings.AUTH_CACHE_TIMEOUT,
+                token["exp"] - time.time()
+            )
+            validated_tokens.set(raw_token, token, timeout)
+        return token
+
+    def cached_user(self, user_id):
+        """The cached user, or None with the version to cache it under"""
+        version = user_version(user_id)
+        entry = users.get(user_id)
+        if entry is not None and entry[0] == version:
+            # views may change request.user, the cached one stays intact
+            return copy.copy(entry[1]), version
+        return None, version
+
+    def cache_user(self, user_id, version, user):
+        users.set(user_id, (version, user), settings.AUTH_CACHE_TIMEOUT)
+        return copy.copy(user)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        user, version = self.cached_user(user_id)
+        if user is None:
+            user = self.cache_user(
+                user_id,
+                version,
+                super().get_user(validated_token)
+            )
+        return user
@@ -0,0 +1,68 @@
+import itertools
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import Flight
+from api.benchmarks.base import asgi_get, measure_concurrent
+
+
+CONCURRENCY = (1, 32)
+
+
+def run(repeat, scale):
+    """
+    Sync DRF views against their async twins under ASGI. Every request
+    gets its own thread and database connection like under uvicorn, so
+    those can't see rolled back seeds: it reads committed flights, ex.
+    from generate_dataset, whatever the scale, and keeps concurrency
+    under max_connections.
+    """
+    flights = list(
+        Flight.objects.order_by("id").values_list("id", flat=True)[:500]
+    )
+    user = get_user_model().objects.filter(is_active=True).first()
+    if not flights or user is None:
+        raise CommandError(
+            "async_flights needs committed flights and users, "
+            "run generate_dataset first"
+        )
+
+    application = ASGIHandler()
+    headers = [
+        (b"authorization", f"Bearer {AccessToken.for_user(user)}".encode())
+    ]
+
+    def endpoint(name, detail, query_string=""):
+        urls = itertools.cycle(
+            [reverse(f"api:{name}", args=[pk]) for pk in flights]
+            if detail
+            else [reverse(f"api:{name}")]
+        )
+        return lambda: asgi_get(
+            application,
+            next(urls),
+            query_string,
+            headers
+        )
+
+    cases = {
+        "list": ("flight-list", "async-flight-list", False, "page=2"),
+        "detail": ("flight-detail", "async-flight-detail", True, ""),
+        "seatmap": ("flight-seatmap", "async-flight-seatmap", True, ""),
+    }
+    results = {}
+    for case, (sync_name, async_name, detail, query) in cases.items():
+        for concurrency in CONCURRENCY:
+            for kind, name in (("sync", sync_name), ("async", async_name)):
+                results[f"{case} {kind}, c={concurrency}"] = (
+                    measure_concurrent(
+                        endpoint(name, detail, query),
+                        repeat,
+                        concurrency
+                    )
+                )
+    return results
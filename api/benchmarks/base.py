@@ -0,0 +1,210 @@
+import asyncio
+import statistics
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rollback():
+    """Everything seeded inside is thrown away when the benchmark ends"""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def analyze():
+    """Fresh planner statistics, seeded tables look empty without them"""
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+
+@contextmanager
+def no_throttling():
+    with mock.patch.object(APIView, "throttle_classes", ()):
+        yield
+
+
+def sample_user(is_staff=False):
+    return get_user_model().objects.create_user(
+        email=f"benchmark{time.monotonic_ns()}@gmail.com",
+        password="password123e",
+        is_staff=is_staff
+    )
+
+
+def sample_client(user=None):
+    client = APIClient(SERVER_NAME="localhost")
+    user = user or sample_user()
+    client.force_authenticate(user)
+    return client
+
+
+class QueryCounter:
+    """
+    Counts queries through execute_wrapper, unlike connection.queries
+    it is not reset by the request_started signal of the test client
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def is_error(result):
+    return getattr(result, "status_code", 200) >= 400
+
+
+def measure(func, repeat) -> dict:
+    queries = QueryCounter()
+    with connection.execute_wrapper(queries):
+        result = func()
+
+    timings, errors = [], int(is_error(result))
+    for _ in range(repeat):
+        start = time.perf_counter()
+        errors += is_error(func())
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    stats = {
+        "mean_ms": statistics.mean(timings),
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[int(0.95 * (len(timings) - 1))],
+        "rps": 1000 / statistics.mean(timings),
+        "queries": queries.count,
+        "errors": errors,
+    }
+    content = getattr(result, "content", None)
+    if content is not None:
+        stats["bytes"] = len(content)
+    return stats
+
+
+async def asgi_get(application, path, query_string="", headers=()):
+    """
+    One GET through an ASGI application the way a server like uvicorn
+    drives it, returns the status code
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), *headers],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    requested = False
+    finished = asyncio.Event()
+    status = None
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif not message.get("more_body"):
+            finished.set()
+
+    await application(scope, receive, send)
+    return status
+
+
+def measure_concurrent(request, total, concurrency) -> dict:
+    """
+    Runs total request() coroutines from one event loop with at most
+    concurrency of them in flight, request() returns a status code
+    """
+    timings, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        start = time.perf_counter()
+        if await request() >= 400:
+            errors += 1
+        timings.append((time.perf_counter() - start) * 1000)
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited():
+            async with semaphore:
+                await one()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limited() for _ in range(total)))
+        return time.perf_counter() - start
+
+    # not async_to_sync, it would send thread sensitive code of every
+    # request back to this thread instead of a thread per request
+    elapsed = asyncio.run(run())
+    timings.sort()
+    return {
+        "concurrency": concurrency,
+        "median_ms": statistics.median(timings),
+        "p99_ms": timings[int(0.99 * (len(timings) - 1))],
+        "rps": total / elapsed,
+        "errors": errors,
+    }
+
+
+def compare(baseline, results, threshold):
+    """
+    Lines comparing median latency and queries of every case with the
+    baseline run, and the cases slower by more than threshold (a fraction)
+    or running more queries
+    """
+    lines, regressions = [], []
+    for name, cases in results.items():
+        for case, stats in cases.items():
+            before = baseline.get(name, {}).get(case)
+            if before is None:
+                lines.append(f"{name}: {case}: not in baseline")
+                continue
+
+            change = stats["median_ms"] / before["median_ms"] - 1
+            line = (
+                f"{name}: {case}: median {before['median_ms']:.2f}ms -> "
+                f"{stats['median_ms']:.2f}ms ({change:+.0%})"
+            )
+            slower = change > threshold
+            more_queries = stats.get("queries", 0) > before.get("queries", 0)
+            if more_queries:
+                line += (
+                    f", queries {before.get('queries', 0)} -> "
+                    f"{stats['queries']}"
+                )
+            if slower or more_queries:
+                line += "  REGRESSION"
+                regressions.append(f"{name}: {case}")
+            lines.append(line)
+    return lines, regressions
@@ -0,0 +1,161 @@
+import io
+import itertools
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError
+from django.db.models import Count
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Flight, Route
+from api.benchmarks.base import analyze, measure, sample_client
+from api.dataset import DatasetGenerator
+from cart.models import Ticket
+
+
+SEED = 20230809
+DAYS = 3
+ORDER_SIZES = (1, 5, 20)
+
+# every token obtain hashes the password, a few are enough
+TOKEN_REPEAT = 20
+
+
+def seed(scale):
+    generator = DatasetGenerator(
+        io.StringIO(),
+        seed=SEED,
+        scale=scale,
+        days=DAYS,
+        load_factor=0.5
+    )
+    if generator.exists():
+        raise CommandError(f"Dataset of seed {SEED} is already committed")
+    generator.generate()
+    analyze()
+    return generator
+
+
+def free_places(flight_ids, size):
+    """Batches of size free places of one flight, (row, seat, flight)"""
+    for flight in Flight.objects.filter(
+            pk__in=flight_ids
+    ).select_related("airplane"):
+        taken = set(
+            Ticket.objects.filter(flight=flight).values_list("row", "seat")
+        )
+        places = [
+            (row, seat, flight.id)
+            for row in range(1, flight.airplane.rows + 1)
+            for seat in range(1, flight.airplane.seats_in_row + 1)
+            if (row, seat) not in taken
+        ]
+        for start in range(0, len(places) - size + 1, size):
+            yield places[start:start + size]
+
+
+def run(repeat, scale):
+    """
+    Hot endpoints over a dataset of generate_dataset at a tenth of its
+    scale, seeded inside the benchmark transaction and rolled back with it
+    """
+    generator = seed(scale / 10)
+    flight_ids = list(
+        Flight.objects.filter(
+            route_id__in=[route for route, _ in generator.routes]
+        ).values_list("id", flat=True)
+    )
+    busiest_route = Route.objects.filter(
+        flights__id__in=flight_ids
+    ).annotate(
+        flights_count=Count("flights")
+    ).order_by("-flights_count").first()
+    customer = get_user_model().objects.filter(
+        pk__in=generator.users
+    ).annotate(
+        orders_count=Count("orders")
+    ).order_by("-orders_count").first()
+
+    client = sample_client(customer)
+    staff = sample_client(
+        get_user_model().objects.create_user(
+            email=f"{generator.prefix.lower()}.staff@example.com",
+            password="password123e",
+            is_staff=True
+        )
+    )
+    details = itertools.cycle(
+        reverse("api:flight-detail", args=[pk]) for pk in flight_ids
+    )
+
+    def uncached(request):
+        def call():
+            cache.clear()
+            return request()
+        return call
+
+    results = {
+        "flight list": measure(
+            uncached(lambda: client.get(reverse("api:flight-list"))),
+            repeat
+        ),
+        "flight list, filtered": measure(
+            uncached(lambda: client.get(
+                reverse("api:flight-list"),
+                {
+                    "route_destination": (
+                        f"{busiest_route.source_id},"
+                        f"{busiest_route.destination_id}"
+                    ),
+                    "airplane": generator.airplanes[0][0],
+                }
+            )),
+            repeat
+        ),
+        "flight detail": measure(
+            uncached(lambda: client.get(next(details))),
+            repeat
+        ),
+    }
+
+    for size in ORDER_SIZES:
+        places = iter(
+            list(itertools.islice(free_places(flight_ids, size), repeat + 1))
+        )
+        results[f"order create, {size} tickets"] = measure(
+            lambda: staff.post(
+                reverse("api:order-list"),
+                {
+                    "tickets": [
+                        {"row": row, "seat": seat, "flight": flight}
+                        for row, seat, flight in next(places)
+                    ]
+                },
+                format="json"
+            ),
+            repeat
+        )
+
+    results["order list"] = measure(
+        uncached(lambda: client.get(reverse("api:order-list"))),
+        repeat
+    )
+    results["crew list"] = measure(
+        uncached(lambda: client.get(reverse("api:crew-list"))),
+        repeat
+    )
+    results["crew list, cached"] = measure(
+        lambda: client.get(reverse("api:crew-list")),
+        repeat
+    )
+
+    anonymous = APIClient(SERVER_NAME="localhost")
+    results["token obtain"] = measure(
+        lambda: anonymous.post(
+            reverse("api:token_obtain_pair"),
+            {"email": customer.email, "password": "password123e"}
+        ),
+        min(repeat, TOKEN_REPEAT)
+    )
+    return results
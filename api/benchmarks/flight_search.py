@@ -0,0 +1,123 @@
+import datetime
+import itertools
+import random
+
+from django.urls import reverse
+from django.utils import timezone
+
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from airport.search import flight_search_index
+from api.benchmarks.base import analyze, measure, sample_client
+
+
+def seed_network(airports=3000, routes_per_airport=8, flights_per_day=20000):
+    generator = random.Random(42)
+    airplane = Airplane.objects.create(
+        name="Benchmark",
+        rows=30,
+        seats_in_row=6,
+        airplane_type=AirplaneType.objects.create(name="Benchmark narrow")
+    )
+    airports = Airport.objects.bulk_create(
+        Airport(name=f"Airport{i}", closest_big_city=f"City{i % 500}")
+        for i in range(airports)
+    )
+    pairs = {
+        (source, destination)
+        for source in range(len(airports))
+        for destination in generator.sample(
+            range(len(airports)),
+            routes_per_airport
+        )
+        if source != destination
+    }
+    routes = Route.objects.bulk_create(
+        Route(
+            source=airports[source],
+            destination=airports[destination],
+            distance=generator.randint(300, 3000)
+        )
+        for source, destination in pairs
+    )
+
+    today = timezone.localdate()
+    start = timezone.make_aware(
+        datetime.datetime.combine(today, datetime.time.min)
+    )
+    flights = []
+    for day in range(2):
+        for _ in range(flights_per_day):
+            route = generator.choice(routes)
+            departure_time = start + datetime.timedelta(
+                days=day,
+                minutes=generator.randint(0, 24 * 60 - 1)
+            )
+            flights.append(
+                Flight(
+                    route=route,
+                    airplane=airplane,
+                    departure_time=departure_time,
+                    arrival_time=departure_time + datetime.timedelta(
+                        minutes=route.distance // 12 + 30
+                    )
+                )
+            )
+    Flight.objects.bulk_create(flights, batch_size=5000)
+    analyze()
+    flight_search_index.clear()
+    return routes, today
+
+
+def run(repeat, scale):
+    routes, today = seed_network(
+        airports=round(3000 * scale),
+        flights_per_day=round(20000 * scale)
+    )
+    client = sample_client()
+    url = reverse("api:flight-search")
+
+    # destinations two routes away, so most searches find itineraries
+    destinations = {}
+    for route in routes:
+        destinations.setdefault(route.source_id, []).append(
+            route.destination_id
+        )
+    generator = random.Random(7)
+    queries = []
+    while len(queries) < repeat:
+        source = generator.choice(routes).source_id
+        stop = generator.choice(destinations[source])
+        if stop in destinations:
+            queries.append(
+                {
+                    "from": source,
+                    "to": generator.choice(destinations[stop]),
+                    "date": today,
+                }
+            )
+    query = itertools.cycle(queries)
+
+    def search(max_legs):
+        params = next(query)
+        return flight_search_index.search(
+            params["from"],
+            params["to"],
+            today,
+            max_legs=max_legs
+        )
+
+    def cold_index():
+        flight_search_index.clear()
+        return search(max_legs=2)
+
+    results = {
+        "index build + search (cold)": measure(cold_index, 5),
+        "engine search, 2 legs": measure(lambda: search(2), repeat),
+        "engine search, 3 legs": measure(lambda: search(3), repeat),
+    }
+    query = itertools.cycle(queries)
+    results["endpoint search, 3 legs"] = measure(
+        lambda: client.get(url, {**next(query), "max_legs": 3}),
+        repeat
+    )
+    return results
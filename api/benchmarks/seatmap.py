@@ -0,0 +1,52 @@
+from django.urls import reverse
+from django.utils import timezone
+
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from api.benchmarks.base import measure, sample_client, sample_user
+from cart.models import Order, Ticket
+
+
+def seed_flight(rows=60, seats_in_row=10, load_factor=0.8):
+    airplane = Airplane.objects.create(
+        name="Benchmark",
+        rows=rows,
+        seats_in_row=seats_in_row,
+        airplane_type=AirplaneType.objects.create(name="Benchmark wide-body")
+    )
+    route = Route.objects.create(
+        source=Airport.objects.create(name="Source", closest_big_city="A"),
+        destination=Airport.objects.create(name="Dest", closest_big_city="B"),
+        distance=1000
+    )
+    flight = Flight.objects.create(
+        route=route,
+        airplane=airplane,
+        departure_time=timezone.now(),
+        arrival_time=timezone.now() + timezone.timedelta(hours=8)
+    )
+    order = Order.objects.create(user=sample_user())
+    Ticket.objects.bulk_create(
+        Ticket(row=row, seat=seat, flight=flight, order=order)
+        for row in range(1, rows + 1)
+        for seat in range(1, seats_in_row + 1)
+        if (row * seats_in_row + seat) % 100 < load_factor * 100
+    )
+    return flight
+
+
+def run(repeat, scale):
+    """One flight whatever the scale"""
+    flight = seed_flight()
+    client = sample_client()
+
+    detail_url = reverse("api:flight-detail", args=[flight.id])
+    seatmap_url = reverse("api:flight-seatmap", args=[flight.id])
+
+    return {
+        "flight detail": measure(lambda: client.get(detail_url), repeat),
+        "flight seatmap": measure(lambda: client.get(seatmap_url), repeat),
+        "flight seatmap (binary)": measure(
+            lambda: client.get(seatmap_url, {"encoding": "binary"}),
+            repeat
+        ),
+    }
@@ -0,0 +1,50 @@
+from api.benchmarks.base import measure
+from api.benchmarks.endpoints import seed
+from api.values import values_renderer
+from api.views.airport_views import (
+    AirplaneViewSet,
+    FlightViewSet,
+    RouteViewSet
+)
+
+
+PAGE_SIZE = 100
+
+
+def with_rows_per_second(stats, rows):
+    stats["rows"] = rows
+    stats["rows_per_s"] = stats["rps"] * rows
+    return stats
+
+
+def run(repeat, scale):
+    """
+    A page of list rows through the list serializer and through
+    the values renderer, the queries are part of both timings
+    """
+    seed(scale / 10)
+
+    results = {}
+    for viewset in (AirplaneViewSet, RouteViewSet, FlightViewSet):
+        view = viewset(action="list")
+        serializer_class = view.get_serializer_class()
+        renderer = values_renderer(serializer_class)
+        queryset = view.get_queryset()
+        name = serializer_class.__name__
+        # small scales seed fewer rows than a page
+        rows = queryset.all()[:PAGE_SIZE].count()
+
+        results[f"{name}, serializer"] = with_rows_per_second(measure(
+            lambda: serializer_class(
+                queryset.all()[:PAGE_SIZE],
+                many=True
+            ).data,
+            repeat
+        ), rows)
+        results[f"{name}, values"] = with_rows_per_second(measure(
+            lambda: renderer.render(
+                renderer.values(queryset)[:PAGE_SIZE]
+            ),
+            repeat
+        ), rows)
+    return results
@@ -0,0 +1,142 @@
+import functools
+import hashlib
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+STATS_KEYS = {
+    "hits": "response_cache:hits",
+    "misses": "response_cache:misses",
+}
+
+
+def version_key(model):
+    return f"response_cache:version:{model._meta.label_lower}"
+
+
+def model_versions(models):
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, 1, timeout=None)
+            versions[key] = cache.get(key, 1)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*models):
+    """Makes every cached response built from these models stale"""
+    for model in models:
+        key = version_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 2, timeout=None)
+
+
+def count(stat):
+    key = STATS_KEYS[stat]
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def stats():
+    counters = cache.get_many(STATS_KEYS.values())
+    return {
+        stat: counters.get(key, 0)
+        for stat, key in STATS_KEYS.items()
+    }
+
+
+class CachedResponseMixin:
+    """
+    Caches list and retrieve data under the request url and
+    the versions of cache_models, any write to them bumps a version
+    so stale responses are never read again
+    """
+
+    cache_models = ()
+    cache_timeout = 60 * 60
+
+    def response_cache_key(self, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        versions = ".".join(map(str, model_versions(self.cache_models)))
+        url = f"{request.get_host()}{request.path}?{query}"
+        return (
+            f"response_cache:{self.basename}:{self.action}:{versions}:"
+            + hashlib.md5(url.encode()).hexdigest()
+        )
+
+    def cached_response(self, view, request, *args, **kwargs):
+        key = self.response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            count("hits")
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        count("misses")
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve,
+            request,
+            *args,
+            **kwargs
+        )
+
+
+def conditional(method):
+    """
+    Answers 304 Not Modified to a matching If-None-Match before the
+    handler runs. The ETag hashes view.get_etag_version(), a cheap stamp
+    of everything the response is built from, with the user, url and
+    accepted media type.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        version = self.get_etag_version(request, *args, **kwargs)
+        if version is None:
+            return method(self, request, *args, **kwargs)
+
+        etag = quote_etag(
+            hashlib.md5(
+                repr(
+                    (
+                        version,
+                        request.user.pk,
+                        request.get_full_path(),
+                        request.META.get("HTTP_ACCEPT"),
+                    )
+                ).encode()
+            ).hexdigest()
+        )
+        if_none_match = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+
+        if etag in if_none_match:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = method(self, request, *args, **kwargs)
+
+        if response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED
+        ):
+            response["ETag"] = etag
+        return response
+
+    return wrapper
@@ -0,0 +1,385 @@
+import datetime
+import math
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from airport.importer import Loader
+from airport.models import (
+    AirplaneType,
+    Airplane,
+    Airport,
+    Route,
+    Crew,
+    Flight
+)
+from cart.models import Order, Ticket
+
+
+CITIES = [
+    ("Kyiv", 50.45, 30.52),
+    ("Lviv", 49.84, 24.03),
+    ("Odesa", 46.48, 30.72),
+    ("Warsaw", 52.23, 21.01),
+    ("Berlin", 52.52, 13.40),
+    ("London", 51.51, -0.13),
+    ("Paris", 48.86, 2.35),
+    ("Madrid", 40.42, -3.70),
+    ("Rome", 41.90, 12.50),
+    ("Vienna", 48.21, 16.37),
+    ("Prague", 50.08, 14.44),
+    ("Istanbul", 41.01, 28.98),
+    ("Dubai", 25.20, 55.27),
+    ("Delhi", 28.61, 77.21),
+    ("Tokyo", 35.68, 139.69),
+    ("Singapore", 1.35, 103.82),
+    ("Sydney", -33.87, 151.21),
+    ("New York", 40.71, -74.01),
+    ("Chicago", 41.88, -87.63),
+    ("Los Angeles", 34.05, -118.24),
+    ("Toronto", 43.65, -79.38),
+    ("Mexico City", 19.43, -99.13),
+    ("Sao Paulo", -23.55, -46.63),
+    ("Cairo", 30.04, 31.24),
+    ("Nairobi", -1.29, 36.82),
+]
+
+# name, rows range, seats_in_row choices
+AIRPLANE_TYPES = [
+    ("Regional jet", (12, 20), (4,)),
+    ("Narrow-body", (25, 35), (6,)),
+    ("Wide-body", (35, 50), (8, 9, 10)),
+]
+
+FIRST_NAMES = [
+    "Anna", "Ivan", "Olena", "Petro", "Maria", "Taras", "Sofia",
+    "Andrii", "Iryna", "Mykola", "Emma", "Liam", "Noah", "Mia",
+]
+LAST_NAMES = [
+    "Koval", "Shevchenko", "Bondar", "Tkachenko", "Melnyk", "Kravets",
+    "Smith", "Brown", "Miller", "Garcia", "Novak", "Schmidt",
+]
+
+ROUTES_PER_AIRPORT = 10
+
+# sizes at scale 1, flights and tickets also grow with days
+SIZES = {
+    "airports": 200,
+    "airplanes": 60,
+    "crews": 400,
+    "users": 2000,
+    "flights_per_day": 1000,
+}
+
+
+def distance(source, destination):
+    """Great-circle distance in kilometers between (lat, lon) points"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*source, *destination))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return max(round(6371 * 2 * math.asin(math.sqrt(a))), 100)
+
+
+def inserted_ids(model, after):
+    return list(
+        model.objects.filter(
+            id__gt=after or 0
+        ).order_by("id").values_list("id", flat=True)
+    )
+
+
+def last_id(model):
+    return model.objects.aggregate(last=Max("id"))["last"]
+
+
+class DatasetGenerator:
+    """
+    Fills the database with a reproducible synthetic schedule: the same
+    seed, scale and start always give the same rows. Writes go through
+    Loader (COPY on PostgreSQL), flights and their tickets are generated
+    in chunks, so memory stays flat however many tickets are made.
+    """
+
+    def __init__(
+            self,
+            stdout,
+            seed=0,
+            scale=1.0,
+            start=None,
+            days=30,
+            load_factor=0.7,
+            max_tickets_per_order=4,
+            chunk_size=2000,
+    ):
+        self.stdout = stdout
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.sizes = {
+            name: max(round(size * scale), 2)
+            for name, size in SIZES.items()
+        }
+        self.start = start or timezone.localdate()
+        self.days = days
+        self.load_factor = load_factor
+        self.max_tickets_per_order = max_tickets_per_order
+        self.chunk_size = chunk_size
+        self.prefix = f"Gen{seed}"
+        self.started = time.monotonic()
+
+    def exists(self):
+        return AirplaneType.objects.filter(
+            name__startswith=f"{self.prefix} "
+        ).exists()
+
+    def log(self, message):
+        self.stdout.write(
+            f"[{time.monotonic() - self.started:7.1f}s] {message}"
+        )
+
+    def insert(self, model, columns, rows):
+        before = last_id(model)
+        with transaction.atomic():
+            Loader(model, columns).insert(rows)
+        return inserted_ids(model, before)
+
+    def generate(self):
+        self.airplanes = self.generate_airplanes()
+        self.airports = self.generate_airports()
+        self.routes = self.generate_routes()
+        self.crews = self.generate_crews()
+        self.users = self.generate_users()
+        self.generate_flights()
+
+    def generate_airplanes(self):
+        type_ids = self.insert(
+            AirplaneType,
+            ("name",),
+            [(f"{self.prefix} {name}",) for name, *_ in AIRPLANE_TYPES]
+        )
+        rows = []
+        for number in range(self.sizes["airplanes"]):
+            index = self.random.randrange(len(AIRPLANE_TYPES))
+            name, rows_range, seats_choices = AIRPLANE_TYPES[index]
+            rows.append(
+                (
+                    f"{self.prefix} {name[:6]} {number}",
+                    self.random.randint(*rows_range),
+                    self.random.choice(seats_choices),
+                    type_ids[index],
+                )
+            )
+        ids = self.insert(
+            Airplane,
+            ("name", "rows", "seats_in_row", "airplane_type_id"),
+            rows
+        )
+        self.log(f"{len(ids)} airplanes")
+        return [
+            (pk, plane_rows, seats_in_row)
+            for pk, (_, plane_rows, seats_in_row, _) in zip(ids, rows)
+        ]
+
+    def generate_airports(self):
+        rows, points = [], []
+        for number in range(self.sizes["airports"]):
+            city, lat, lon = self.random.choice(CITIES)
+            rows.append((f"{self.prefix} {city} {number}", city))
+            points.append(
+                (
+                    lat + self.random.uniform(-2, 2),
+                    lon + self.random.uniform(-2, 2),
+                )
+            )
+        ids = self.insert(Airport, ("name", "closest_big_city"), rows)
+        self.log(f"{len(ids)} airports")
+        return list(zip(ids, points))
+
+    def generate_routes(self):
+        # a tenth of the airports are hubs that get most of the routes
+        hubs = self.airports[:max(len(self.airports) // 10, 2)]
+        pairs = {}
+        for source in self.airports:
+            for _ in range(ROUTES_PER_AIRPORT):
+                destination = self.random.choice(
+                    hubs if self.random.random() < 0.6 else self.airports
+                )
+                if destination is not source:
+                    pairs[(source[0], destination[0])] = distance(
+                        source[1],
+                        destination[1]
+                    )
+        rows = [(*pair, km) for pair, km in pairs.items()]
+        ids = self.insert(
+            Route,
+            ("source_id", "destination_id", "distance"),
+            rows
+        )
+        self.log(f"{len(ids)} routes")
+        return [(pk, row[2]) for pk, row in zip(ids, rows)]
+
+    def generate_crews(self):
+        ids = self.insert(
+            Crew,
+            ("first_name", "last_name"),
+            [
+                (
+                    self.random.choice(FIRST_NAMES),
+                    self.random.choice(LAST_NAMES),
+                )
+                for _ in range(self.sizes["crews"])
+            ]
+        )
+        self.log(f"{len(ids)} crews")
+        return ids
+
+    def generate_users(self):
+        password = make_password("password123e")
+        now = timezone.now()
+        ids = self.insert(
+            get_user_model(),
+            (
+                "email",
+                "password",
+                "first_name",
+                "last_name",
+                "is_staff",
+                "is_superuser",
+                "is_active",
+                "date_joined",
+            ),
+            [
+                (
+                    f"{self.prefix.lower()}.user{number}@example.com",
+                    password,
+                    self.random.choice(FIRST_NAMES),
+                    self.random.choice(LAST_NAMES),
+                    False,
+                    False,
+                    True,
+                    now,
+                )
+                for number in range(self.sizes["users"])
+            ]
+        )
+        self.log(f"{len(ids)} users, password password123e")
+        return ids
+
+    def flight_rows(self):
+        midnight = timezone.make_aware(
+            datetime.datetime.combine(self.start, datetime.time.min)
+        )
+        for day in range(self.days):
+            for _ in range(self.sizes["flights_per_day"]):
+                route, km = self.random.choice(self.routes)
+                airplane = self.random.choice(self.airplanes)
+                departure_time = midnight + datetime.timedelta(
+                    days=day,
+                    minutes=self.random.randint(5 * 60, 24 * 60 - 1)
+                )
+                yield route, airplane, departure_time, km
+
+    def generate_flights(self):
+        flights = self.flight_rows()
+        total_flights = total_tickets = 0
+        while chunk := [
+            flight for _, flight in zip(range(self.chunk_size), flights)
+        ]:
+            total_tickets += self.generate_flight_chunk(chunk)
+            total_flights += len(chunk)
+            elapsed = time.monotonic() - self.started
+            self.log(
+                f"{total_flights} flights, {total_tickets} tickets "
+                f"({total_tickets / elapsed:.0f} tickets/s)"
+            )
+
+    def generate_flight_chunk(self, chunk):
+        flight_rows, places = [], []
+        for route, airplane, departure_time, km in chunk:
+            airplane_id, rows, seats_in_row = airplane
+            capacity = rows * seats_in_row
+            load = min(max(self.random.gauss(self.load_factor, 0.15), 0), 1)
+            sold = self.random.sample(range(capacity), round(capacity * load))
+            places.append((seats_in_row, departure_time, sold))
+            flight_rows.append(
+                (
+                    route,
+                    airplane_id,
+                    departure_time,
+                    departure_time + datetime.timedelta(
+                        minutes=km * 60 // 800 + 30
+                    ),
+                    len(sold),
+                    0,
+                )
+            )
+
+        # bookings happen before the first day of the schedule
+        opened = timezone.make_aware(
+            datetime.datetime.combine(self.start, datetime.time.min)
+        )
+        with transaction.atomic():
+            flight_ids = self.insert(
+                Flight,
+                (
+                    "route_id",
+                    "airplane_id",
+                    "departure_time",
+                    "arrival_time",
+                    "tickets_sold",
+                    "tickets_version",
+                ),
+                flight_rows
+            )
+            Loader(Flight.crews.through, ("flight_id", "crew_id")).insert(
+                [
+                    (flight_id, crew)
+                    for flight_id in flight_ids
+                    for crew in self.random.sample(
+                        self.crews,
+                        min(self.random.randint(2, 4), len(self.crews))
+                    )
+                ]
+            )
+
+            orders, tickets = [], []
+            for flight_id, (seats_in_row, departure_time, sold) in zip(
+                    flight_ids,
+                    places
+            ):
+                while sold:
+                    size = self.random.randint(1, self.max_tickets_per_order)
+                    booked_at = departure_time - datetime.timedelta(
+                        hours=self.random.randint(1, 60 * 24)
+                    )
+                    orders.append(
+                        (
+                            min(booked_at, opened),
+                            self.random.choice(self.users),
+                        )
+                    )
+                    for place in sold[:size]:
+                        tickets.append(
+                            (
+                                place // seats_in_row + 1,
+                                place % seats_in_row + 1,
+                                flight_id,
+                                len(orders) - 1,
+                            )
+                        )
+                    sold = sold[size:]
+
+            order_ids = self.insert(Order, ("created_at", "user_id"), orders)
+            Loader(Ticket, ("row", "seat", "flight_id", "order_id")).insert(
+                [
+                    (row, seat, flight_id, order_ids[order])
+                    for row, seat, flight_id, order in tickets
+                ]
+            )
+        return len(tickets)
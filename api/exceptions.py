@@ -0,0 +1,18 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PlacesTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Places are already taken."
+    default_code = "places_taken"
+
+    def __init__(self, places):
+        super().__init__()
+        self.detail = {
+            "detail": self.detail,
+            "taken_places": [
+                {"flight": flight_id, "row": row, "seat": seat}
+                for flight_id, row, seat in sorted(places)
+            ]
+        }
@@ -0,0 +1,77 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from cart.models import Ticket
+
+
+EXPORT_FIELDS = {
+    "order": "order_id",
+    "created_at": "order__created_at",
+    "user": "order__user__email",
+    "ticket": "id",
+    "row": "row",
+    "seat": "seat",
+    "flight": "flight_id",
+    "source": "flight__route__source__name",
+    "destination": "flight__route__destination__name",
+    "departure_time": "flight__departure_time",
+    "arrival_time": "flight__arrival_time",
+    "airplane": "flight__airplane__name",
+}
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_rows(
+        created_after=None,
+        created_before=None,
+        flights=None,
+        chunk_size=2000
+):
+    """
+    Tickets with their orders and flights as plain tuples, fetched in
+    chunks (server-side cursor on PostgreSQL), so memory stays flat
+    """
+    tickets = Ticket.objects.order_by("id")
+
+    if created_after:
+        tickets = tickets.filter(order__created_at__gte=created_after)
+    if created_before:
+        tickets = tickets.filter(order__created_at__lt=created_before)
+    if flights:
+        tickets = tickets.filter(flight_id__in=flights)
+
+    return tickets.values_list(*EXPORT_FIELDS.values()).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(
+            dict(zip(EXPORT_FIELDS, row)),
+            cls=DjangoJSONEncoder
+        ) + "\n"
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def export_lines(output, rows):
+    if output == "csv":
+        return csv_lines(rows)
+    return ndjson_lines(rows)
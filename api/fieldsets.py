@@ -0,0 +1,170 @@
+import functools
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+@functools.lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """Source attrs of the fields serializer_class renders, by name"""
+    return {
+        name: tuple(field.source_attrs)
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    }
+
+
+def split(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def select_related_paths(select_related, prefix=""):
+    """["route__source", ...] of a query.select_related tree"""
+    paths = []
+    for name, children in select_related.items():
+        path = prefix + name
+        paths.extend(select_related_paths(children, path + "__") or [path])
+    return paths
+
+
+def column_paths(model, sources, annotations):
+    """
+    only() lookups loading the columns of sources, None when a source
+    is not a field (a property or the whole object) so every column
+    has to be loaded
+    """
+    paths = []
+    for attrs in sources:
+        if not attrs:
+            return None
+        if attrs[0] in annotations:
+            continue
+
+        opts, path = model._meta, []
+        for attr in attrs:
+            try:
+                field = opts.get_field(attr)
+            except FieldDoesNotExist:
+                return None
+            if field.many_to_many or field.one_to_many:
+                # prefetched, the pk is always loaded
+                break
+            path.append(attr)
+            if not field.is_relation:
+                break
+            opts = field.related_model._meta
+        if path:
+            paths.append("__".join(path))
+    return paths
+
+
+def narrow_queryset(queryset, sources):
+    """
+    Drops select_related, prefetch_related and annotations that none
+    of sources (tuples of source attrs) reads and loads only the
+    columns they read
+    """
+    queryset = queryset.all()
+    query = queryset.query
+    paths = {"__".join(attrs) for attrs in sources}
+    roots = {attrs[0] for attrs in sources if attrs}
+
+    if isinstance(query.select_related, dict):
+        related = [
+            lookup
+            for lookup in select_related_paths(query.select_related)
+            if any(
+                path == lookup
+                or path.startswith(lookup + "__")
+                # nested serializers render related objects of path
+                or lookup.startswith(path + "__")
+                for path in paths
+            )
+        ]
+        queryset = queryset.select_related(None).select_related(*related)
+
+    prefetches = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if (
+            lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+        ).split("__")[0] in roots
+    ]
+    queryset = queryset.prefetch_related(None).prefetch_related(*prefetches)
+
+    # masked annotations still work in filters and ordering
+    # but are not selected
+    annotations = set(query.annotation_select)
+    if annotations - roots:
+        queryset.query.set_annotation_mask(annotations & roots)
+
+    columns = column_paths(queryset.model, sources, query.annotations)
+    if columns is not None:
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+class SparseFieldsetsMixin:
+    """
+    ?fields=id,name renders only these fields of list and retrieve
+    responses and ?omit=crews renders all but these. The queryset
+    follows: only() the columns the fields read, without select_related,
+    prefetch_related and annotations of the other fields
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    def get_sparse_fields(self, serializer_class):
+        """Names of the fields to render, None for all of them"""
+        request = getattr(self, "request", None)
+        if request is None or self.action not in self.sparse_actions:
+            return None
+
+        fields = split(request.query_params.get("fields", ""))
+        omit = split(request.query_params.get("omit", ""))
+        if not fields and not omit:
+            return None
+
+        declared = readable_fields(serializer_class)
+        unknown = (fields | omit) - set(declared)
+        if unknown:
+            raise ValidationError(
+                {
+                    "fields": [
+                        f"Unknown fields: {', '.join(sorted(unknown))}"
+                    ]
+                }
+            )
+        return frozenset((fields or set(declared)) - omit)
+
+    def get_ordering_fields(self):
+        """Fields cursor pagination reads from the last row of a page"""
+        ordering = getattr(self.paginator, "ordering", None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering, )
+        return [field.lstrip("-") for field in ordering]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields(self.get_serializer_class())
+        if fields is not None:
+            rendered = serializer
+            if isinstance(serializer, serializers.ListSerializer):
+                rendered = serializer.child
+            for name in set(rendered.fields) - fields:
+                del rendered.fields[name]
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        fields = self.get_sparse_fields(serializer_class)
+        if fields is None:
+            return queryset
+
+        declared = readable_fields(serializer_class)
+        sources = [declared[name] for name in fields]
+        sources.extend((field, ) for field in self.get_ordering_fields())
+        return narrow_queryset(queryset, sources)
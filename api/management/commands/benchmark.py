@@ -0,0 +1,125 @@
+import json
+from importlib import import_module
+
+from django.core.management import BaseCommand, CommandError
+
+from api.benchmarks.base import compare, no_throttling, rollback
+
+
+BENCHMARKS = [
+    "endpoints",
+    "seatmap",
+    "flight_search",
+    "async_flights",
+    "values_serialization",
+]
+
+# read committed data (generate_dataset), they only run when named
+ON_DEMAND = {"async_flights"}
+
+
+class Command(BaseCommand):
+    """
+    Django command to benchmark api endpoints in-process,
+    seeded data is rolled back after every benchmark
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names",
+            nargs="*",
+            help=f"Benchmarks to run: {', '.join(BENCHMARKS)}, "
+                 f"all but {', '.join(sorted(ON_DEMAND))} by default",
+        )
+        parser.add_argument("--repeat", type=int, default=100)
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Size of the seeded data",
+        )
+        parser.add_argument(
+            "--save",
+            metavar="PATH",
+            help="Write the results as a JSON baseline",
+        )
+        parser.add_argument(
+            "--compare",
+            metavar="PATH",
+            help="Compare with a JSON baseline, fail on regressions",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Slowdown of the median counted as a regression, "
+                 "0.2 by default",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["names"]) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(f"Unknown benchmarks: {', '.join(unknown)}")
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                baseline = json.load(file)
+            if (
+                baseline["repeat"] != options["repeat"]
+                or baseline["scale"] != options["scale"]
+            ):
+                self.stdout.write(self.style.WARNING(
+                    f"Baseline ran with --repeat {baseline['repeat']} "
+                    f"--scale {baseline['scale']}"
+                ))
+
+        results = {}
+        names = options["names"] or [
+            name for name in BENCHMARKS if name not in ON_DEMAND
+        ]
+        for name in names:
+            benchmark = import_module(f"api.benchmarks.{name}")
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+
+            with rollback(), no_throttling():
+                results[name] = benchmark.run(
+                    options["repeat"],
+                    options["scale"]
+                )
+
+            for case, stats in results[name].items():
+                self.stdout.write(
+                    f"  {case:<40}"
+                    + "  ".join(
+                        f"{key}={value:.2f}"
+                        if isinstance(value, float) else f"{key}={value}"
+                        for key, value in stats.items()
+                    )
+                )
+
+        if options["save"]:
+            with open(options["save"], "w") as file:
+                json.dump(
+                    {
+                        "repeat": options["repeat"],
+                        "scale": options["scale"],
+                        "results": results,
+                    },
+                    file,
+                    indent=2
+                )
+
+        if baseline is not None:
+            lines, regressions = compare(
+                baseline["results"],
+                results,
+                options["threshold"]
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING("baseline"))
+            for line in lines:
+                self.stdout.write(f"  {line}")
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} regressions: {', '.join(regressions)}"
+                )
@@ -0,0 +1,51 @@
+import datetime
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from airport.models import Crew, Flight, FlightSchedule
+from airport.schedules import expand_schedules
+from airport.search import flight_search_index
+from api.cache import bump_versions
+
+
+class Command(BaseCommand):
+    """Django command to generate flights from schedules for a horizon"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Horizon in days from today",
+        )
+        parser.add_argument(
+            "--until",
+            type=datetime.date.fromisoformat,
+            help="Last day to generate, overrides --days",
+        )
+        parser.add_argument(
+            "--schedule",
+            type=int,
+            action="append",
+            dest="schedules",
+        )
+
+    def handle(self, *args, **options):
+        until = options["until"] or (
+            timezone.localdate() + datetime.timedelta(days=options["days"])
+        )
+        schedules = FlightSchedule.objects.all()
+        if options["schedules"]:
+            schedules = schedules.filter(id__in=options["schedules"])
+
+        created = expand_schedules(until, schedules)
+
+        if created:
+            # bulk writes skip the signals that keep these caches fresh
+            bump_versions(Flight, Crew)
+            flight_search_index.clear()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {created} flight(s) until {until}")
+        )
@@ -0,0 +1,54 @@
+import argparse
+
+from django.core.management import BaseCommand
+from django.utils.dateparse import parse_datetime
+
+from api.export import export_lines, export_rows
+
+
+def datetime_argument(value):
+    """parse_datetime for argparse, which returns None on garbage"""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"invalid datetime: {value!r}")
+    return parsed
+
+
+class Command(BaseCommand):
+    """Django command to stream tickets with orders and flights to a file"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            choices=["ndjson", "csv"],
+            default="ndjson",
+        )
+        parser.add_argument(
+            "--file",
+            help="Path to write to, stdout by default",
+        )
+        parser.add_argument("--created-after", type=datetime_argument)
+        parser.add_argument("--created-before", type=datetime_argument)
+        parser.add_argument(
+            "--flight",
+            type=int,
+            action="append",
+            dest="flights",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            created_after=options["created_after"],
+            created_before=options["created_before"],
+            flights=options["flights"],
+            chunk_size=options["chunk_size"],
+        )
+        lines = export_lines(options["output"], rows)
+
+        if options["file"]:
+            with open(options["file"], "w", newline="") as file:
+                file.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
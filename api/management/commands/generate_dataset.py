@@ -0,0 +1,64 @@
+import datetime
+
+from django.core.management import BaseCommand, CommandError
+
+from airport.search import flight_search_index
+from api.benchmarks.base import analyze
+from api.cache import bump_versions
+from api.dataset import DatasetGenerator
+from api.signals import CACHED_MODELS
+
+
+class Command(BaseCommand):
+    """Django command to fill the database with a synthetic dataset"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiplies airports, airplanes, crews, users and "
+                 "flights per day, 1 is ~4 million tickets over 30 days",
+        )
+        parser.add_argument(
+            "--start",
+            type=datetime.date.fromisoformat,
+            help="First day of flights, today by default",
+        )
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument(
+            "--load-factor",
+            type=float,
+            default=0.7,
+            help="Average share of sold seats per flight",
+        )
+        parser.add_argument("--max-tickets-per-order", type=int, default=4)
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not 0 <= options["load_factor"] <= 1:
+            raise CommandError("--load-factor must be between 0 and 1")
+
+        generator = DatasetGenerator(
+            self.stdout,
+            seed=options["seed"],
+            scale=options["scale"],
+            start=options["start"],
+            days=options["days"],
+            load_factor=options["load_factor"],
+            max_tickets_per_order=options["max_tickets_per_order"],
+            chunk_size=options["chunk_size"],
+        )
+        if generator.exists():
+            raise CommandError(
+                f"Dataset with seed {options['seed']} is already generated"
+            )
+        generator.generate()
+
+        # bulk writes skip the signals that keep these caches fresh
+        bump_versions(*CACHED_MODELS)
+        flight_search_index.clear()
+        analyze()
+
+        self.stdout.write(self.style.SUCCESS("Dataset generated"))
@@ -0,0 +1,43 @@
+from django.core.management import BaseCommand, CommandError
+
+from airport.importer import IMPORTERS
+from airport.search import flight_search_index
+from api.cache import bump_versions
+from api.signals import CACHED_MODELS
+
+
+class Command(BaseCommand):
+    """Django command to upsert the schedule from CSV or NDJSON files"""
+
+    def add_arguments(self, parser):
+        for name in IMPORTERS:
+            parser.add_argument(
+                f"--{name}",
+                metavar="PATH",
+                help=f"CSV (by .csv extension) or NDJSON file of {name}",
+            )
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        paths = {
+            name: options[name]
+            for name in IMPORTERS
+            if options[name]
+        }
+        if not paths:
+            raise CommandError(
+                "Nothing to import, pass at least one of "
+                + ", ".join(f"--{name}" for name in IMPORTERS)
+            )
+
+        for name, path in paths.items():
+            IMPORTERS[name](
+                self.stdout,
+                batch_size=options["batch_size"]
+            ).run(path)
+
+        # bulk writes skip the signals that keep these caches fresh
+        bump_versions(*CACHED_MODELS)
+        flight_search_index.clear()
+
+        self.stdout.write(self.style.SUCCESS("Schedule imported"))
@@ -0,0 +1,42 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from airport.models import Flight
+from cart.models import Ticket
+
+
+class Command(BaseCommand):
+    """Django command to fix Flight.tickets_sold drifted from real tickets"""
+
+    def handle(self, *args, **options):
+        sold = Coalesce(
+            Subquery(
+                Ticket.objects.filter(
+                    flight=OuterRef("pk")
+                ).order_by().values(
+                    "flight"
+                ).annotate(
+                    sold=Count("pk")
+                ).values("sold")
+            ),
+            0
+        )
+
+        with transaction.atomic():
+            drifted = list(
+                Flight.objects.select_for_update().annotate(
+                    sold=sold
+                ).exclude(
+                    tickets_sold=F("sold")
+                ).values_list("pk", flat=True)
+            )
+            Flight.objects.filter(pk__in=drifted).update(
+                tickets_sold=sold,
+                tickets_version=F("tickets_version") + 1
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled {len(drifted)} flight(s)")
+        )
@@ -0,0 +1,309 @@
+import contextvars
+import functools
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async
+)
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+PREFIX = "airport"
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+METRICS = {
+    "http_requests_total": (
+        "counter",
+        "Requests by view, method and status"
+    ),
+    "http_request_duration_seconds": (
+        "histogram",
+        "Time to build the response"
+    ),
+    "http_response_size_bytes_total": (
+        "counter",
+        "Bytes of response bodies, streamed ones are not counted"
+    ),
+    "db_queries_total": (
+        "counter",
+        "Database queries run for requests"
+    ),
+    "db_query_duration_seconds_total": (
+        "counter",
+        "Time spent in database queries of requests"
+    ),
+}
+
+
+class MemoryMetrics:
+    """Series of this process only"""
+
+    def __init__(self):
+        self.values = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def add(self, increments):
+        with self.lock:
+            for series, value in increments:
+                self.values[series] += value
+
+    def collect(self):
+        with self.lock:
+            return dict(self.values)
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+
+
+class SQLiteMetrics:
+    """
+    Series in a SQLite file shared by the worker processes of the host,
+    the increments of a request are one transaction of upserts
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+    def connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=5,
+                isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metrics ("
+                "name TEXT NOT NULL, "
+                "labels TEXT NOT NULL, "
+                "value REAL NOT NULL, "
+                "PRIMARY KEY (name, labels)"
+                ") WITHOUT ROWID"
+            )
+            self.local.connection = connection
+        return connection
+
+    def add(self, increments):
+        connection = self.connection()
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO metrics VALUES (?, ?, ?) "
+                "ON CONFLICT(name, labels) "
+                "DO UPDATE SET value = value + excluded.value",
+                [
+                    (name, labels, value)
+                    for (name, labels), value in increments
+                ]
+            )
+
+    def collect(self):
+        rows = self.connection().execute(
+            "SELECT name, labels, value FROM metrics"
+        )
+        return {(name, labels): value for name, labels, value in rows}
+
+    def clear(self):
+        self.connection().execute("DELETE FROM metrics")
+
+
+memory_metrics = MemoryMetrics()
+
+
+@functools.lru_cache(maxsize=None)
+def sqlite_metrics(path):
+    return SQLiteMetrics(path)
+
+
+def store():
+    if settings.METRICS_SQLITE_PATH:
+        return sqlite_metrics(settings.METRICS_SQLITE_PATH)
+    return memory_metrics
+
+
+def labels(**values):
+    return ",".join(
+        f'{name}="{value}"'
+        for name, value in values.items()
+    )
+
+
+def view_name(request):
+    """FlightViewSet.list for viewsets, CacheStatsView.get for views"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    view = getattr(match.func, "cls", None)
+    if view is None:
+        return match.func.__name__
+    method = request.method.lower()
+    action = (getattr(match.func, "actions", None) or {}).get(method, method)
+    return f"{view.__name__}.{action}"
+
+
+class QueryTimer:
+    """connection.execute_wrapper counting queries and their time"""
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.queries += 1
+
+
+# QueryTimer of the request being handled, contextvars follow the
+# request into the threads sync_to_async runs its queries in
+request_timer = contextvars.ContextVar("request_timer", default=None)
+
+
+def time_queries(execute, sql, params, many, context):
+    """Execute wrapper of every connection, times queries of requests"""
+    timer = request_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install(connection, **kwargs):
+    # first, execute_wrapper() pops the last wrapper when it exits
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_queries)
+
+
+connection_created.connect(install)
+
+
+class MetricsMiddleware:
+    """Records count, latency, queries and response size of every view"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        # connections opened before this module was imported
+        for alias in connections:
+            install(connections[alias])
+
+        timer = QueryTimer()
+        token = request_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = request_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_timer.reset(token)
+        duration = time.perf_counter() - start
+
+        if isinstance(store(), SQLiteMetrics):
+            # a file write, kept off the event loop
+            await sync_to_async(self.record, thread_sensitive=False)(
+                request,
+                response,
+                duration,
+                timer
+            )
+        else:
+            self.record(request, response, duration, timer)
+        return response
+
+    def record(self, request, response, duration, timer):
+        name = view_name(request)
+        view = labels(view=name)
+        bucket = f"{view},le=" + next(
+            (str(bound) for bound in BUCKETS if duration <= bound),
+            "+Inf"
+        )
+        status = labels(
+            view=name,
+            method=request.method,
+            status=response.status_code
+        )
+        size = 0 if response.streaming else len(response.content)
+        store().add([
+            (("http_requests_total", status), 1),
+            (("http_request_duration_seconds_bucket", bucket), 1),
+            (("http_request_duration_seconds_sum", view), duration),
+            (("http_request_duration_seconds_count", view), 1),
+            (("http_response_size_bytes_total", view), size),
+            (("db_queries_total", view), timer.queries),
+            (("db_query_duration_seconds_total", view), timer.duration),
+        ])
+
+
+def number(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render(values):
+    """Prometheus text exposition of the collected series"""
+    series = defaultdict(list)
+    for (name, series_labels), value in sorted(values.items()):
+        series[name].append((series_labels, value))
+
+    lines = []
+    for metric, (kind, description) in METRICS.items():
+        lines.append(f"# HELP {PREFIX}_{metric} {description}")
+        lines.append(f"# TYPE {PREFIX}_{metric} {kind}")
+        if kind == "histogram":
+            lines.extend(render_histogram(metric, series))
+            continue
+        for series_labels, value in series[metric]:
+            lines.append(
+                f"{PREFIX}_{metric}{{{series_labels}}} {number(value)}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def render_histogram(metric, series):
+    """Buckets are stored one per request, exposed cumulative"""
+    buckets = defaultdict(dict)
+    for series_labels, value in series[f"{metric}_bucket"]:
+        view, _, bound = series_labels.rpartition(",le=")
+        buckets[view][bound] = value
+
+    for view, counts in buckets.items():
+        total = 0
+        for bound in (*map(str, BUCKETS), "+Inf"):
+            total += counts.get(bound, 0)
+            yield (
+                f'{PREFIX}_{metric}_bucket{{{view},le="{bound}"}} '
+                f"{number(total)}"
+            )
+    for suffix in ("sum", "count"):
+        for view, value in series[f"{metric}_{suffix}"]:
+            yield f"{PREFIX}_{metric}_{suffix}{{{view}}} {number(value)}"
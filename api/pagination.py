@@ -0,0 +1,161 @@
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Postgres planner estimate of the rows of queryset: reltuples of the
+    table for a whole table, the row estimate of EXPLAIN otherwise.
+    None without an estimate (other backends, never analyzed tables)
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    query = queryset.query
+    with connection.cursor() as cursor:
+        if (
+            not query.where
+            and not query.distinct
+            and query.group_by is None
+            and not query.combinator
+        ):
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)]
+            )
+            rows = cursor.fetchone()[0]
+        else:
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            rows = plan[0]["Plan"]["Plan Rows"]
+    # reltuples is -1 for tables that were never analyzed
+    return int(rows) if rows >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts from planner estimates of at least threshold rows
+    (ESTIMATED_COUNT_THRESHOLD by default), smaller results are counted
+    exactly. count_exact tells which one count is. Pages past an
+    estimated count are not refused, it may be short of the real one
+    """
+
+    threshold = None
+    count_exact = True
+
+    @cached_property
+    def count(self):
+        threshold = self.threshold
+        if threshold is None:
+            threshold = settings.ESTIMATED_COUNT_THRESHOLD
+
+        estimate = estimate_count(self.object_list)
+        self.count_exact = estimate is None or estimate < threshold
+        if self.count_exact:
+            return Paginator.count.func(self)
+        return estimate
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_exact or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if self.count_exact and top + self.orphans >= self.count:
+            top = self.count
+        return self._get_page(self.object_list[bottom:top], number, self)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Page numbers over EstimatedCountPaginator, count_exact in the
+    response tells whether count is exact or a planner estimate
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_next_link(self):
+        if self.page.paginator.count_exact:
+            return super().get_next_link()
+        # a short page is the last one whatever the estimate says
+        if len(self.page) < self.page.paginator.per_page:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.page.number + 1
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("count", self.page.paginator.count),
+            ("count_exact", self.page.paginator.count_exact),
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["count_exact"] = {
+            "type": "boolean",
+            "example": True,
+        }
+        return schema
+
+
+class FlightCursorPagination(CursorPagination):
+    ordering = ("departure_time", "id")
+
+
+class OrderCursorPagination(CursorPagination):
+    ordering = ("created_at", "id")
+
+
+class CursorPaginationMixin:
+    """
+    Lets clients switch a list to cursor pagination (?pagination=cursor),
+    page number pagination stays the default
+    """
+
+    cursor_pagination_class = None
+
+    def use_cursor_pagination(self):
+        request = getattr(self, "request", None)
+        return bool(
+            self.cursor_pagination_class
+            and request is not None
+            and (
+                request.query_params.get("pagination") == "cursor"
+                or "cursor" in request.query_params
+            )
+        )
+
+    @property
+    def paginator(self):
+        if not self.use_cursor_pagination():
+            return super().paginator
+        if not hasattr(self, "_paginator"):
+            self._paginator = self.cursor_pagination_class()
+        return self._paginator
@@ -1,5 +1,9 @@
+import base64
+import datetime
+
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.relations import MANY_RELATION_KWARGS
 
 from airport.models import (
     AirplaneType,
@@ -13,6 +17,52 @@ from airport.models import (
 from cart.models import Ticket
 
 
+def as_pk(value):
+    if isinstance(value, (int, str)) and not isinstance(value, bool):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    return None
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Looks objects up among the ones prefetched for the whole list,
+    with many=True one query fetches all of them
+    """
+
+    prefetched = None
+
+    def to_internal_value(self, data):
+        instance = (self.prefetched or {}).get(as_pk(data))
+        if instance is not None:
+            return instance
+        return super().to_internal_value(data)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        return PrefetchedManyRelatedField(
+            child_relation=cls(*args, **kwargs),
+            **{
+                key: value
+                for key, value in kwargs.items()
+                if key in MANY_RELATION_KWARGS
+            }
+        )
+
+
+class PrefetchedManyRelatedField(serializers.ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, (list, tuple)):
+            pks = {as_pk(item) for item in data}
+            pks.discard(None)
+            self.child_relation.prefetched = (
+                self.child_relation.get_queryset().in_bulk(pks)
+            )
+        return super().to_internal_value(data)
+
+
 class AirplaneTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = AirplaneType
@@ -124,6 +174,8 @@ class FlightTakenPlaces(serializers.ModelSerializer):
 
 
 class FlightSerializer(serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     class Meta:
         model = Flight
         fields = [
@@ -136,6 +188,20 @@ class FlightSerializer(serializers.ModelSerializer):
         ]
 
 
+class CrewNamesField(serializers.ListField):
+    """
+    Crew display names from the crew_names annotation of flight lists,
+    or from prefetched crews where the annotation is not available
+    """
+
+    child = serializers.CharField()
+
+    def get_attribute(self, instance):
+        if not hasattr(instance, "crew_names"):
+            return [str(crew) for crew in instance.crews.all()]
+        return instance.crew_names
+
+
 class FlightListSerializer(serializers.ModelSerializer):
     route_full_name = serializers.CharField(read_only=True)
     available_tickets = serializers.IntegerField(read_only=True)
@@ -143,8 +209,8 @@ class FlightListSerializer(serializers.ModelSerializer):
         source="airplane.name",
         read_only=True
     )
-    crews = serializers.StringRelatedField(
-        many=True,
+    crews = CrewNamesField(
+        source="crew_names",
         read_only=True
     )
 
@@ -182,3 +248,59 @@ class FlightDetailSerializer(FlightSerializer):
 
     class Meta(FlightSerializer.Meta):
         fields = FlightSerializer.Meta.fields + ["taken_places"]
+
+
+class FlightSeatMapSerializer(serializers.ModelSerializer):
+    rows = serializers.IntegerField(
+        source="airplane.rows",
+        read_only=True
+    )
+    seats_in_row = serializers.IntegerField(
+        source="airplane.seats_in_row",
+        read_only=True
+    )
+    taken_places = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Flight
+        fields = ["id", "rows", "seats_in_row", "taken_places"]
+
+    def get_taken_places(self, obj) -> str:
+        return base64.b64encode(obj.taken_places_bitmap()).decode()
+
+
+class FlightSearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    date = serializers.DateField()
+    max_legs = serializers.IntegerField(min_value=1, max_value=4, default=2)
+    order = serializers.ChoiceField(
+        choices=["duration", "distance"],
+        default="duration"
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate_date(self, value):
+        # connections are searched days past the date
+        if value.year >= datetime.MAXYEAR:
+            raise ValidationError(
+                f"Date must be before {datetime.MAXYEAR}-01-01."
+            )
+        return value
+
+
+class ItineraryLegSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(source="flight_id")
+    source = serializers.CharField(source="source_name")
+    destination = serializers.CharField(source="destination_name")
+    distance = serializers.IntegerField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+
+
+class ItinerarySerializer(serializers.Serializer):
+    legs = ItineraryLegSerializer(many=True)
+    distance = serializers.IntegerField()
+    duration = serializers.DurationField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
@@ -1,12 +1,83 @@
+import random
+import time
+from collections import Counter
+
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, OperationalError, transaction
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
 
-from api.serializers.airport_serializers import FlightListSerializer
+from airport.models import Flight
+from api.exceptions import PlacesTaken
+from api.serializers.airport_serializers import (
+    as_pk,
+    FlightListSerializer,
+    PrefetchedPrimaryKeyRelatedField
+)
 from cart.models import Ticket, Order
 
 
+class TicketBatchSerializer(serializers.ListSerializer):
+    """
+    Validates all tickets of an order together: flights with airplanes
+    are fetched in one query. Places taken by other orders are checked
+    under the flight lock in OrderSerializer.book and answered with 409
+    """
+
+    def prefetch_flights(self, data):
+        flight_ids = {
+            as_pk(item.get("flight"))
+            for item in data
+            if isinstance(item, dict)
+        }
+        flight_ids.discard(None)
+        flights = Flight.objects.select_related("airplane").in_bulk(
+            flight_ids
+        )
+        self.child.fields["flight"].prefetched = flights
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.prefetch_flights(data)
+
+        tickets = super().to_internal_value(data)
+
+        places = [
+            (ticket["flight"].id, ticket["row"], ticket["seat"])
+            for ticket in tickets
+        ]
+        ordered = set()
+
+        errors = []
+        for place in places:
+            if place in ordered:
+                errors.append(
+                    {
+                        "non_field_errors": [
+                            serializers.ErrorDetail(
+                                UniqueTogetherValidator.message.format(
+                                    field_names="flight, row, seat"
+                                ),
+                                code="unique"
+                            )
+                        ]
+                    }
+                )
+            else:
+                errors.append({})
+            ordered.add(place)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return tickets
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    # prefetched for the whole order by TicketBatchSerializer
+    flight = PrefetchedPrimaryKeyRelatedField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+
     def validate(self, attrs):
         data = super().validate(attrs=attrs)
 
@@ -26,6 +97,8 @@ class TicketSerializer(serializers.ModelSerializer):
             "seat",
             "flight"
         ]
+        validators = []
+        list_serializer_class = TicketBatchSerializer
 
 
 class TicketListSerializer(TicketSerializer):
@@ -50,12 +123,69 @@ class OrderSerializer(serializers.ModelSerializer):
             "created_at"
         ]
 
+    booking_attempts = 3
+
+    @staticmethod
+    def is_serialization_failure(error):
+        # serialization_failure and deadlock_detected SQLSTATE codes
+        return getattr(error.__cause__, "pgcode", None) in ("40001", "40P01")
+
     def create(self, validated_data):
+        tickets_data = validated_data.pop("tickets")
+
+        for attempt in range(1, self.booking_attempts + 1):
+            try:
+                return self.book(validated_data, tickets_data)
+            except IntegrityError:
+                # places taken bypassing the flight lock,
+                # the next attempt reports them as 409
+                if attempt == self.booking_attempts:
+                    raise
+            except OperationalError as error:
+                if (
+                    not self.is_serialization_failure(error)
+                    or attempt == self.booking_attempts
+                ):
+                    raise
+            time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+
+    @staticmethod
+    def book(validated_data, tickets_data):
+        """
+        Flights are locked in id order, so concurrent orders for the same
+        flight check and insert their places one after another
+        """
         with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
+            flight_ids = sorted(
+                {ticket_data["flight"].id for ticket_data in tickets_data}
+            )
+            list(
+                Flight.objects.select_for_update().filter(
+                    pk__in=flight_ids
+                ).order_by("pk").values_list("pk", flat=True)
+            )
+
+            taken_places = Ticket.taken_places(
+                [
+                    (
+                        ticket_data["flight"].id,
+                        ticket_data["row"],
+                        ticket_data["seat"]
+                    )
+                    for ticket_data in tickets_data
+                ]
+            )
+            if taken_places:
+                raise PlacesTaken(taken_places)
+
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            tickets = Ticket.objects.bulk_create(
+                Ticket(order=order, **ticket_data)
+                for ticket_data in tickets_data
+            )
+            Flight.update_tickets_sold(
+                Counter(ticket.flight_id for ticket in tickets)
+            )
             return order
 
 
@@ -64,3 +194,16 @@ class OrderListSerializer(OrderSerializer):
         many=True,
         read_only=True
     )
+
+
+class ExportSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+        choices=["ndjson", "csv"],
+        default="ndjson"
+    )
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    flights = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False
+    )
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from airport.models import (
+    AirplaneType,
+    Airplane,
+    Airport,
+    Route,
+    Crew,
+    Flight
+)
+from api.authentication import invalidate_user
+from api.cache import bump_versions
+
+
+CACHED_MODELS = (AirplaneType, Airplane, Airport, Route, Crew, Flight)
+
+
+@receiver([post_save, post_delete])
+def bump_cached_model_version(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        bump_versions(sender)
+
+
+@receiver(m2m_changed, sender=Flight.crews.through)
+def bump_flight_crews_version(sender, **kwargs):
+    bump_versions(Flight, Crew)
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
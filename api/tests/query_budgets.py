@@ -0,0 +1,117 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, resolve, URLPattern
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import authentication
+
+
+def endpoint_name(callback, method):
+    """FlightViewSet.list, CacheStatsView.get or flight_list"""
+    view = getattr(callback, "cls", None)
+    if view is None:
+        return callback.__name__
+    actions = getattr(callback, "actions", None) or {}
+    return f"{view.__name__}.{actions.get(method, method)}"
+
+
+def query_budget(callback, method):
+    """Budget declared in query_budgets of the view by action or method"""
+    view = getattr(callback, "cls", callback)
+    actions = getattr(callback, "actions", None) or {}
+    return getattr(view, "query_budgets", {}).get(
+        actions.get(method, method)
+    )
+
+
+def endpoints(urlconf="api.urls"):
+    """(callback, method) of every route of urlconf"""
+    patterns = list(get_resolver(urlconf).url_patterns)
+    found = {}
+    while patterns:
+        pattern = patterns.pop()
+        if not isinstance(pattern, URLPattern):
+            patterns.extend(pattern.url_patterns)
+            continue
+        callback = pattern.callback
+        actions = getattr(callback, "actions", None)
+        view = getattr(callback, "cls", None)
+        if actions is not None:
+            methods = actions
+        elif view is not None:
+            methods = [
+                method
+                for method in view.http_method_names
+                if method not in ("head", "options") and hasattr(view, method)
+            ]
+        else:
+            methods = ["get"]
+        for method in methods:
+            found[endpoint_name(callback, method)] = (callback, method)
+    return found
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+    Calls an endpoint with 1 and with many related objects, both must run
+    the same number of queries, no more than the budget of the view
+    """
+
+    many = 5
+
+    def authenticate(self, user):
+        self.access_token = AccessToken.for_user(user)
+        self.headers = {"Authorization": f"Bearer {self.access_token}"}
+        self.client = APIClient(headers=self.headers)
+        self.async_client = AsyncClient()
+
+    def call(self, method, url, data=None):
+        callback = resolve(url.split("?")[0]).func
+        if getattr(callback, "cls", None) is None:
+            return async_to_sync(getattr(self.async_client, method))(
+                url,
+                data,
+                headers=self.headers
+            )
+        response = getattr(self.client, method)(url, data, format="json")
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def measure(self, method, setup, related):
+        """Queries of the call, the data setup creates is rolled back"""
+        with transaction.atomic():
+            url, data = setup(related)
+            cache.clear()
+            authentication.validated_tokens.clear()
+            authentication.users.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.call(method, url, data)
+            transaction.set_rollback(True)
+        if response.status_code >= 400:
+            self.fail(f"{url} answered {response.status_code}")
+        return url, queries.captured_queries
+
+    def assertQueryBudget(self, method, setup):
+        """setup(n) creates n related objects, returns the url and data"""
+        url, one = self.measure(method, setup, 1)
+        _, many = self.measure(method, setup, self.many)
+
+        callback = resolve(url.split("?")[0]).func
+        name = endpoint_name(callback, method)
+        budget = query_budget(callback, method)
+        if budget is None:
+            self.fail(f"{name} declares no query budget")
+        if len(one) != len(many) or len(many) > budget:
+            self.fail(
+                f"{name} ran {len(one)} queries with 1 related object, "
+                f"{len(many)} with {self.many}, the budget is {budget}:\n"
+                + "\n".join(
+                    f"{number}. {query['sql']}"
+                    for number, query in enumerate(many, start=1)
+                )
+            )
@@ -0,0 +1,163 @@
+import json
+import unittest
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import Airplane, Crew
+from api.tests.filters.test_airport_filter import sample_flight
+from cart.models import Order, Ticket
+
+
+class TestAsyncFlights(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e"
+        )
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+        self.sync_client = APIClient(headers=self.headers)
+        self.async_client = AsyncClient()
+
+        self.flights = [sample_flight(4) for _ in range(12)]
+        self.flights[0].crews.add(
+            Crew.objects.create(first_name="Olena", last_name="Koval"),
+            Crew.objects.create(first_name="Ivan", last_name="Petrenko"),
+        )
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 3):
+            Ticket.objects.create(
+                row=2,
+                seat=seat,
+                flight=self.flights[0],
+                order=order
+            )
+
+    async def assertSameResponse(self, sync_name, async_name, params=None,
+                                 **kwargs):
+        sync_response = await self.sync_get(
+            reverse(f"api:{sync_name}", kwargs=kwargs),
+            params
+        )
+        async_response = await self.async_get(
+            reverse(f"api:{async_name}", kwargs=kwargs),
+            params
+        )
+
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(
+            json.loads(async_response.content),
+            json.loads(sync_response.content.decode().replace(
+                "/airport/flights/",
+                "/airport/async/flights/"
+            ))
+        )
+        return async_response
+
+    async def sync_get(self, url, params):
+        return await sync_to_async(self.sync_client.get)(url, params)
+
+    async def async_get(self, url, params=None):
+        # AsyncClient(headers=...) defaults are not sent by Django 4.2
+        return await self.async_client.get(url, params, headers=self.headers)
+
+    async def test_list_matches_sync_list(self):
+        await self.assertSameResponse("flight-list", "async-flight-list")
+        await self.assertSameResponse(
+            "flight-list",
+            "async-flight-list",
+            {"page": 2}
+        )
+        await self.assertSameResponse(
+            "flight-list",
+            "async-flight-list",
+            {"airplane": self.flights[0].airplane_id}
+        )
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql",
+        "Planner estimates are read on PostgreSQL"
+    )
+    async def test_estimated_list_matches_sync_list(self):
+        await sync_to_async(self.analyze)()
+        with self.settings(ESTIMATED_COUNT_THRESHOLD=1):
+            response = await self.assertSameResponse(
+                "flight-list",
+                "async-flight-list"
+            )
+            self.assertFalse(response.json()["count_exact"])
+            for page in (2, 3):
+                response = await self.assertSameResponse(
+                    "flight-list",
+                    "async-flight-list",
+                    {"page": page}
+                )
+                self.assertIsNone(response.json()["next"])
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE airport_flight")
+
+    async def test_detail_matches_sync_detail(self):
+        await self.assertSameResponse(
+            "flight-detail",
+            "async-flight-detail",
+            pk=self.flights[0].pk
+        )
+
+    async def test_seatmap_matches_sync_seatmap(self):
+        await self.assertSameResponse(
+            "flight-seatmap",
+            "async-flight-seatmap",
+            pk=self.flights[0].pk
+        )
+        response = await self.async_get(
+            reverse(
+                "api:async-flight-seatmap",
+                kwargs={"pk": self.flights[0].pk}
+            ),
+            {"encoding": "binary"}
+        )
+        self.assertEqual(response.content, b"\x14\x00")
+
+    async def test_seatmap_of_smaller_airplane(self):
+        # row 2 of the tickets is outside the single row airplane
+        self.flights[0].airplane = await Airplane.objects.acreate(
+            name="Smaller",
+            rows=1,
+            seats_in_row=7,
+            airplane_type_id=self.flights[0].airplane.airplane_type_id
+        )
+        await self.flights[0].asave()
+
+        response = await self.assertSameResponse(
+            "flight-seatmap",
+            "async-flight-seatmap",
+            pk=self.flights[0].pk
+        )
+        self.assertEqual(response.json()["taken_places"], "AA==")
+
+    async def test_errors(self):
+        url = reverse("api:async-flight-list")
+
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("WWW-Authenticate", response.headers)
+
+        response = await self.async_client.post(url, headers=self.headers)
+        self.assertEqual(response.status_code, 405)
+
+        response = await self.async_get(url, {"page": 9})
+        self.assertEqual(response.json(), {"detail": "Invalid page."})
+
+        response = await self.async_get(
+            reverse("api:async-flight-detail", kwargs={"pk": 0})
+        )
+        self.assertEqual(response.status_code, 404)
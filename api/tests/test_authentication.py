@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import authentication
+from api.authentication import TTLCache
+
+
+class TestTTLCache(SimpleTestCase):
+    def test_evicts_least_recently_used_and_expired(self):
+        entries = TTLCache(maxsize=2)
+        entries.set("a", 1, timeout=60)
+        entries.set("b", 2, timeout=60)
+        entries.get("a")
+        entries.set("c", 3, timeout=60)
+
+        self.assertEqual(
+            [entries.get(key) for key in "abc"],
+            [1, None, 3]
+        )
+
+        with mock.patch("time.monotonic", return_value=10 ** 9):
+            self.assertIsNone(entries.get("a"))
+        self.assertNotIn("a", entries.entries)
+
+
+class TestCachedJWTAuthentication(TestCase):
+    def setUp(self):
+        cache.clear()
+        authentication.validated_tokens.clear()
+        authentication.users.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e"
+        )
+        self.client = APIClient(
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        )
+        self.url = reverse("api:profile")
+
+    def test_repeated_requests_skip_token_check_and_user_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+        with mock.patch.object(
+            AccessToken,
+            "verify",
+            side_effect=AssertionError
+        ), self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data["email"], "user@gmail.com")
+
+    def test_saving_user_invalidates(self):
+        self.client.get(self.url)
+
+        response = self.client.patch(
+            self.url,
+            {"email": "new@gmail.com", "password": "password456e"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["email"], "new@gmail.com")
+
+        self.user.refresh_from_db()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_other_process_sees_shared_version(self):
+        self.client.get(self.url)
+
+        # another process saved the user, only the shared cache changed
+        cache.incr(authentication.user_version_key(self.user.pk))
+        get_user_model().objects.filter(pk=self.user.pk).update(is_staff=True)
+
+        response = self.client.get(self.url)
+        self.assertTrue(response.data["is_staff"])
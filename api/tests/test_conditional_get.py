@@ -0,0 +1,126 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.tests.filters.test_airport_filter import sample_flight
+from cart.models import Order
+
+
+class TestConditionalGet(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(4)
+
+    def book(self, row, seat, client=None, flight=None):
+        response = (client or self.client).post(
+            reverse("api:order-list"),
+            {
+                "tickets": [
+                    {
+                        "row": row,
+                        "seat": seat,
+                        "flight": (flight or self.flight).id
+                    }
+                ]
+            },
+            format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        return response
+
+    def assertNotModified(self, url, etag, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(etag, response["ETag"])
+        self.assertFalse(response.content)
+
+    def test_flight_retrieve(self):
+        url = reverse("api:flight-detail", args=[self.flight.id])
+        etag = self.client.get(url)["ETag"]
+
+        self.assertNotModified(url, etag, queries=1)
+
+        self.book(1, 1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(etag, response["ETag"])
+        self.assertEqual(1, len(response.data["taken_places"]))
+
+    def test_flight_retrieve_not_found(self):
+        response = self.client.get(
+            reverse("api:flight-detail", args=[0]),
+            HTTP_IF_NONE_MATCH="*"
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+    def test_order_list(self):
+        self.book(1, 1)
+        url = reverse("api:order-list")
+        etag = self.client.get(url)["ETag"]
+
+        self.assertNotModified(url, etag, queries=1)
+
+        other = APIClient()
+        other.force_authenticate(
+            get_user_model().objects.create_user(
+                email="other@gmail.com",
+                password="password123e",
+                is_staff=True
+            )
+        )
+        self.book(1, 2, client=other)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(etag, response["ETag"])
+
+    def test_order_list_sold_moves_between_flights(self):
+        flight = sample_flight(4)
+        self.book(1, 1)
+        self.book(1, 1, flight=flight)
+        other = APIClient()
+        other.force_authenticate(
+            get_user_model().objects.create_user(
+                email="other@gmail.com",
+                password="password123e",
+                is_staff=True
+            )
+        )
+        released = self.book(1, 2, client=other, flight=flight)
+        url = reverse("api:order-list")
+        etag = self.client.get(url)["ETag"]
+
+        # tickets_sold of both flights sum up as before
+        self.book(1, 2, client=other)
+        Order.objects.get(pk=released.data["id"]).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(etag, response["ETag"])
+
+    def test_etag_differs_per_user(self):
+        url = reverse("api:order-list")
+        etag = self.client.get(url)["ETag"]
+
+        other = APIClient()
+        other.force_authenticate(
+            get_user_model().objects.create_user(
+                email="other@gmail.com",
+                password="password123e"
+            )
+        )
+
+        self.assertNotEqual(etag, other.get(url)["ETag"])
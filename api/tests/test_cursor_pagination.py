@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airport.models import Flight
+from api.tests.filters.test_airport_filter import sample_flight
+from cart.models import Order
+
+
+class TestCursorPagination(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e"
+        )
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            ids += [item["id"] for item in response.data["results"]]
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_flights(self):
+        flight = sample_flight(2)
+        departure_time = timezone.now()
+        for hours in [5, 1, 3, 1] * 3:
+            Flight.objects.create(
+                route=flight.route,
+                airplane=flight.airplane,
+                departure_time=departure_time + timezone.timedelta(hours=hours),
+                arrival_time=departure_time + timezone.timedelta(days=1)
+            )
+
+        ids = self.walk(reverse("api:flight-list"), {"pagination": "cursor"})
+
+        self.assertEqual(
+            list(
+                Flight.objects.order_by(
+                    "departure_time", "id"
+                ).values_list("id", flat=True)
+            ),
+            ids
+        )
+
+    def test_orders(self):
+        Order.objects.bulk_create(Order(user=self.user) for _ in range(15))
+
+        ids = self.walk(reverse("api:order-list"), {"pagination": "cursor"})
+
+        self.assertEqual(
+            list(
+                Order.objects.order_by(
+                    "created_at", "id"
+                ).values_list("id", flat=True)
+            ),
+            ids
+        )
+
+    def test_page_number_stays_default(self):
+        response = self.client.get(reverse("api:flight-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("count", response.data)
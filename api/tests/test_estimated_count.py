@@ -0,0 +1,78 @@
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Flight
+from api.pagination import EstimatedCountPaginator
+from api.tests.filters.test_airport_filter import sample_flight
+
+
+class TestEstimatedCount(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@gmail.com",
+                password="password123e"
+            )
+        )
+        self.flights = [sample_flight(i + 2) for i in range(3)]
+        self.url = reverse("api:flight-list")
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE airport_flight")
+
+    def test_exact_below_threshold(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 3)
+        self.assertTrue(response.data["count_exact"])
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql",
+        "Planner estimates are read on PostgreSQL"
+    )
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1)
+    def test_table_estimate(self):
+        self.analyze()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 3)
+        self.assertFalse(response.data["count_exact"])
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNone(response.data["next"])
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql",
+        "Planner estimates are read on PostgreSQL"
+    )
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=1)
+    def test_filtered_estimate(self):
+        self.analyze()
+
+        response = self.client.get(
+            self.url,
+            {"airplane": self.flights[0].airplane_id}
+        )
+        self.assertFalse(response.data["count_exact"])
+        self.assertGreaterEqual(response.data["count"], 1)
+        self.assertEqual(
+            [flight["id"] for flight in response.data["results"]],
+            [self.flights[0].id]
+        )
+
+    def test_pages_past_the_estimate(self):
+        paginator = EstimatedCountPaginator(
+            Flight.objects.order_by("id"),
+            per_page=1
+        )
+        # an estimate short of the real count
+        paginator.count = 2
+        paginator.count_exact = False
+
+        page = paginator.page(3)
+        self.assertEqual(list(page), [self.flights[2]])
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.tests.filters.test_airport_filter import sample_flight
+from cart.models import Order, Ticket
+
+
+class TestExport(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse("api:order-export")
+
+        self.flights = [sample_flight(3), sample_flight(4)]
+        self.order = Order.objects.create(user=self.user)
+        for flight in self.flights:
+            for seat in (1, 2):
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    flight=flight,
+                    order=self.order
+                )
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        lines = self.export().splitlines()
+
+        self.assertEqual(4, len(lines))
+        ticket = json.loads(lines[0])
+        self.assertEqual(self.order.id, ticket["order"])
+        self.assertEqual("admin@gmail.com", ticket["user"])
+        self.assertEqual(self.flights[0].id, ticket["flight"])
+        self.assertEqual(
+            self.flights[0].route.source.name,
+            ticket["source"]
+        )
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(output="csv"))))
+
+        self.assertEqual(4, len(rows))
+        self.assertEqual("2", rows[1]["seat"])
+
+    def test_flight_filter(self):
+        lines = self.export(flights=self.flights[1].id).splitlines()
+
+        self.assertEqual(2, len(lines))
+        self.assertTrue(
+            all(
+                json.loads(line)["flight"] == self.flights[1].id
+                for line in lines
+            )
+        )
+
+    def test_created_filter(self):
+        self.assertEqual(
+            "",
+            self.export(created_after="2100-01-01T00:00:00Z")
+        )
+
+    def test_staff_only(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("r", suffix=".csv") as file:
+            call_command(
+                "export_tickets",
+                output="csv",
+                file=file.name,
+                flights=[self.flights[0].id]
+            )
+            rows = list(csv.DictReader(file))
+
+        self.assertEqual(2, len(rows))
+
+    def test_command_stdout(self):
+        stdout = io.StringIO()
+        call_command(
+            "export_tickets",
+            flights=[self.flights[0].id],
+            stdout=stdout
+        )
+
+        self.assertEqual(2, len(stdout.getvalue().splitlines()))
+
+    def test_command_invalid_datetime(self):
+        with self.assertRaisesMessage(CommandError, "invalid datetime"):
+            call_command("export_tickets", "--created-after", "yesterday")
@@ -0,0 +1,138 @@
+import datetime
+import io
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    FlightSchedule,
+    Route
+)
+from airport.schedules import expand_schedules
+
+
+# 2030-01-07 is a Monday
+MONDAY = datetime.date(2030, 1, 7)
+
+
+def aware(day, hour, minute=0):
+    return timezone.make_aware(
+        datetime.datetime.combine(day, datetime.time(hour, minute))
+    )
+
+
+class TestFlightSchedules(TestCase):
+    def setUp(self):
+        self.route = Route.objects.create(
+            source=Airport.objects.create(
+                name="Boryspil",
+                closest_big_city="Kyiv"
+            ),
+            destination=Airport.objects.create(
+                name="Heathrow",
+                closest_big_city="London"
+            ),
+            distance=2100
+        )
+        self.airplane = Airplane.objects.create(
+            name="Boeing",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Jet")
+        )
+        self.crews = [
+            Crew.objects.create(first_name="Ivan", last_name="Petrenko"),
+            Crew.objects.create(first_name="Olena", last_name="Koval"),
+        ]
+        self.schedule = FlightSchedule.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            weekdays="135",
+            departure_time=datetime.time(22, 30),
+            arrival_time=datetime.time(1, 15),
+            valid_from=MONDAY,
+            valid_until=MONDAY + datetime.timedelta(days=27),
+        )
+        self.schedule.crews.set(self.crews)
+
+    def test_expand_generates_flights_on_weekdays(self):
+        created = expand_schedules(MONDAY + datetime.timedelta(days=6))
+
+        self.assertEqual(created, 3)
+        flights = Flight.objects.order_by("departure_time")
+        self.assertEqual(
+            [flight.departure_time for flight in flights],
+            [
+                aware(MONDAY, 22, 30),
+                aware(MONDAY + datetime.timedelta(days=2), 22, 30),
+                aware(MONDAY + datetime.timedelta(days=4), 22, 30),
+            ]
+        )
+        self.assertEqual(
+            flights[0].arrival_time,
+            aware(MONDAY + datetime.timedelta(days=1), 1, 15)
+        )
+        for flight in flights:
+            self.assertEqual(
+                set(flight.crews.values_list("id", flat=True)),
+                {crew.id for crew in self.crews}
+            )
+
+    def test_expand_is_incremental(self):
+        expand_schedules(MONDAY + datetime.timedelta(days=6))
+        self.schedule.refresh_from_db()
+        self.assertEqual(
+            self.schedule.generated_until,
+            MONDAY + datetime.timedelta(days=6)
+        )
+
+        self.assertEqual(
+            expand_schedules(MONDAY + datetime.timedelta(days=6)),
+            0
+        )
+        self.assertEqual(
+            expand_schedules(MONDAY + datetime.timedelta(days=100)),
+            9
+        )
+        self.assertEqual(Flight.objects.count(), 12)
+        self.assertEqual(Flight.crews.through.objects.count(), 24)
+
+    def test_expand_skips_existing_flights(self):
+        Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=aware(MONDAY, 22, 30),
+            arrival_time=aware(MONDAY + datetime.timedelta(days=1), 1, 15),
+        )
+
+        created = expand_schedules(MONDAY + datetime.timedelta(days=6))
+
+        self.assertEqual(created, 2)
+        self.assertEqual(Flight.objects.count(), 3)
+
+    def test_expand_queries_do_not_grow_with_flights(self):
+        with self.assertNumQueries(8):
+            expand_schedules(MONDAY + datetime.timedelta(days=27))
+
+    def test_weekdays_are_validated(self):
+        for weekdays in ("", "8", "113"):
+            self.schedule.weekdays = weekdays
+            with self.assertRaises(ValidationError):
+                self.schedule.full_clean()
+
+    def test_command_expands_until_date(self):
+        stdout = io.StringIO()
+        call_command(
+            "expand_schedules",
+            until=MONDAY + datetime.timedelta(days=13),
+            stdout=stdout
+        )
+
+        self.assertIn("Generated 6 flight(s)", stdout.getvalue())
@@ -0,0 +1,138 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from airport.search import flight_search_index
+
+
+DAY = datetime.date(2023, 8, 9)
+
+
+def at(hour, minute=0, days=0):
+    return datetime.datetime(
+        DAY.year,
+        DAY.month,
+        DAY.day,
+        hour,
+        minute,
+        tzinfo=datetime.timezone.utc
+    ) + datetime.timedelta(days=days)
+
+
+class TestFlightSearch(TestCase):
+    def setUp(self):
+        flight_search_index.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e"
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse("api:flight-search")
+
+        self.airplane = Airplane.objects.create(
+            name="Airplane",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Type")
+        )
+        self.a, self.b, self.c, self.d = Airport.objects.bulk_create(
+            Airport(name=name, closest_big_city=name) for name in "ABCD"
+        )
+        self.direct = self.flight(self.a, self.c, 1500, at(9), at(15))
+        self.first_leg = self.flight(self.a, self.b, 1000, at(8), at(10))
+        self.short_connection = self.flight(
+            self.b, self.c, 1000, at(10, 30), at(12)
+        )
+        self.second_leg = self.flight(self.b, self.c, 1000, at(11), at(13))
+        self.next_day = self.flight(self.a, self.c, 1500, at(9, days=1), at(15, days=1))
+
+    def flight(self, source, destination, distance, departure, arrival):
+        route, _ = Route.objects.get_or_create(
+            source=source,
+            destination=destination,
+            defaults={"distance": distance}
+        )
+        return Flight.objects.create(
+            route=route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=arrival
+        )
+
+    def search(self, **params):
+        response = self.client.get(
+            self.url,
+            {"from": self.a.id, "to": self.c.id, "date": DAY, **params}
+        )
+        self.assertEqual(response.status_code, 200)
+        return [
+            [leg["flight"] for leg in itinerary["legs"]]
+            for itinerary in response.data
+        ]
+
+    def test_direct_only(self):
+        self.assertEqual([[self.direct.id]], self.search(max_legs=1))
+
+    def test_connections_by_duration(self):
+        self.assertEqual(
+            [[self.first_leg.id, self.second_leg.id], [self.direct.id]],
+            self.search()
+        )
+
+    def test_connections_by_distance(self):
+        self.assertEqual(
+            [[self.direct.id], [self.first_leg.id, self.second_leg.id]],
+            self.search(order="distance")
+        )
+
+    def test_itinerary(self):
+        response = self.client.get(
+            self.url,
+            {"from": self.a.id, "to": self.c.id, "date": DAY, "limit": 1}
+        )
+
+        self.assertEqual(1, len(response.data))
+        self.assertEqual(2000, response.data[0]["distance"])
+        self.assertEqual("05:00:00", response.data[0]["duration"])
+        self.assertEqual("B", response.data[0]["legs"][0]["destination"])
+
+    def test_index_refreshed_on_new_flight(self):
+        self.search()
+        faster = self.flight(self.b, self.c, 1000, at(10, 45), at(11, 30))
+
+        self.assertEqual(
+            [self.first_leg.id, faster.id],
+            self.search()[0]
+        )
+
+    def test_required_params(self):
+        response = self.client.get(self.url, {"from": self.a.id})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("destination", response.data)
+        self.assertIn("date", response.data)
+
+    def test_date_out_of_range(self):
+        response = self.client.get(
+            self.url,
+            {"from": self.a.id, "to": self.c.id, "date": "9999-12-31"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("date", response.data)
+
+    def test_days_evicted(self):
+        flight_search_index.max_days = 2
+        self.addCleanup(delattr, flight_search_index, "max_days")
+        for days in range(4):
+            self.search(date=DAY + datetime.timedelta(days=days))
+
+        self.assertEqual(
+            [DAY + datetime.timedelta(days=days) for days in (2, 3)],
+            list(flight_search_index.days)
+        )
@@ -0,0 +1,82 @@
+import base64
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Airplane
+from api.tests.filters.test_airport_filter import sample_flight
+from cart.models import Order, Ticket
+
+
+class TestFlightSeatMap(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(3)
+        self.url = reverse("api:flight-seatmap", args=[self.flight.id])
+
+        order = Order.objects.create(user=self.user)
+        for row, seat in [(1, 1), (2, 2)]:
+            Ticket.objects.create(
+                row=row,
+                seat=seat,
+                flight=self.flight,
+                order=order
+            )
+
+    def test_seatmap(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(2, response.data["rows"])
+        self.assertEqual(2, response.data["seats_in_row"])
+        self.assertEqual(
+            bytes([0b10010000]),
+            base64.b64decode(response.data["taken_places"])
+        )
+
+    def test_seatmap_binary(self):
+        response = self.client.get(self.url, {"encoding": "binary"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual("application/octet-stream", response["Content-Type"])
+        self.assertEqual("2", response["X-Seatmap-Seats-In-Row"])
+        self.assertEqual(bytes([0b10010000]), response.content)
+
+
+    def test_places_outside_smaller_airplane(self):
+        # (2, 2) has no place on 1 x 3, its index 4 would still fit
+        self.flight.airplane = Airplane.objects.create(
+            name="Smaller",
+            rows=1,
+            seats_in_row=3,
+            airplane_type=self.flight.airplane.airplane_type
+        )
+        self.flight.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            bytes([0b10000000]),
+            base64.b64decode(response.data["taken_places"])
+        )
+
+        # (2, 2) on 1 x 7 is bit 8, past the end of the one byte bitmap
+        self.flight.airplane.seats_in_row = 7
+        self.flight.airplane.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            bytes([0b10000000]),
+            base64.b64decode(response.data["taken_places"])
+        )
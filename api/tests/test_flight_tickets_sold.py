@@ -0,0 +1,88 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Flight
+from api.tests.filters.test_airport_filter import sample_flight
+from cart.models import Order, Ticket
+
+
+class TestFlightTicketsSold(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(4)
+
+    def book(self, *places):
+        return self.client.post(
+            reverse("api:order-list"),
+            {
+                "tickets": [
+                    {"row": row, "seat": seat, "flight": self.flight.id}
+                    for row, seat in places
+                ]
+            },
+            format="json"
+        )
+
+    def test_order_create_increments_tickets_sold(self):
+        response = self.book((1, 1), (1, 2))
+
+        self.assertEqual(response.status_code, 201)
+        self.flight.refresh_from_db()
+        self.assertEqual(2, self.flight.tickets_sold)
+
+    def test_ticket_delete_decrements_tickets_sold(self):
+        self.book((1, 1), (1, 2), (2, 1))
+
+        Ticket.objects.filter(row=1).delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(1, self.flight.tickets_sold)
+
+        Order.objects.all().delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(0, self.flight.tickets_sold)
+
+    def test_ticket_moved_to_another_flight(self):
+        self.book((1, 1), (1, 2))
+        other = sample_flight(4)
+
+        ticket = Ticket.objects.get(row=1, seat=1)
+        ticket.flight = other
+        ticket.save()
+        ticket.row = 2
+        ticket.save()
+
+        self.flight.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(1, self.flight.tickets_sold)
+        self.assertEqual(1, other.tickets_sold)
+
+    def test_available_tickets_uses_tickets_sold(self):
+        self.book((1, 1))
+
+        response = self.client.get(reverse("api:flight-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.flight.airplane.capacity - 1,
+            response.data["results"][0]["available_tickets"]
+        )
+
+    def test_reconcile_tickets_sold(self):
+        self.book((1, 1), (1, 2))
+        Flight.objects.update(tickets_sold=10)
+
+        call_command("reconcile_tickets_sold", stdout=StringIO())
+
+        self.flight.refresh_from_db()
+        self.assertEqual(2, self.flight.tickets_sold)
@@ -0,0 +1,80 @@
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.db.models import Count, F
+from django.test import TestCase
+
+from airport.models import AirplaneType, Airport, Crew, Flight
+from cart.models import Ticket
+
+
+class TestGenerateDataset(TestCase):
+    def generate(self, seed=1):
+        call_command(
+            "generate_dataset",
+            seed=seed,
+            scale=0.02,
+            days=2,
+            start=datetime.date(2030, 1, 1),
+            chunk_size=7,
+            stdout=io.StringIO()
+        )
+
+    def snapshot(self):
+        return list(
+            Ticket.objects.order_by(
+                "flight__departure_time",
+                "row",
+                "seat"
+            ).values_list(
+                "row",
+                "seat",
+                "flight__departure_time",
+                "flight__route__distance",
+                "flight__airplane__rows",
+                "order__user__email",
+            )
+        )
+
+    def test_dataset_is_consistent(self):
+        self.generate()
+
+        self.assertEqual(Flight.objects.count(), 40)
+        self.assertTrue(Ticket.objects.exists())
+        self.assertFalse(
+            Flight.objects.annotate(
+                sold=Count("tickets")
+            ).exclude(tickets_sold=F("sold")).exists()
+        )
+        self.assertFalse(
+            Ticket.objects.filter(
+                row__gt=F("flight__airplane__rows")
+            ).exists()
+        )
+        self.assertFalse(
+            Ticket.objects.filter(
+                seat__gt=F("flight__airplane__seats_in_row")
+            ).exists()
+        )
+        self.assertFalse(Flight.objects.filter(crews=None).exists())
+
+    def test_same_seed_gives_same_dataset(self):
+        self.generate()
+        snapshot = self.snapshot()
+
+        AirplaneType.objects.all().delete()
+        Airport.objects.all().delete()
+        Crew.objects.all().delete()
+        get_user_model().objects.all().delete()
+        self.generate()
+
+        self.assertEqual(self.snapshot(), snapshot)
+
+    def test_seed_can_be_generated_once(self):
+        self.generate()
+
+        with self.assertRaises(CommandError):
+            self.generate()
+        self.generate(seed=2)
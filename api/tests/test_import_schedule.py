@@ -0,0 +1,148 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from airport.models import Airplane, Airport, Crew, Flight, Route
+
+
+AIRPORTS_CSV = """name,closest_big_city
+Boryspil,Kyiv
+Lviv,Lviv
+Heathrow,London
+,Nowhere
+"""
+
+AIRPLANES = [
+    {
+        "name": "Boeing",
+        "rows": 10,
+        "seats_in_row": 6,
+        "airplane_type": "Jet"
+    },
+    {"name": "Broken", "rows": 0, "seats_in_row": 6, "airplane_type": "Jet"},
+]
+
+ROUTES_CSV = """source,destination,distance
+Boryspil,Lviv,470
+Lviv,Heathrow,1800
+Lviv,Lviv,1
+Boryspil,Unknown,5
+"""
+
+CREWS_CSV = """first_name,last_name
+Ivan,Petrenko
+Olena,Koval
+"""
+
+FLIGHTS = [
+    {
+        "source": "Boryspil",
+        "destination": "Lviv",
+        "airplane": "Boeing",
+        "departure_time": "2030-01-01T10:00:00+00:00",
+        "arrival_time": "2030-01-01T11:00:00+00:00",
+        "crews": ["Ivan Petrenko", "Olena Koval"],
+    },
+    {
+        "source": "Lviv",
+        "destination": "Heathrow",
+        "airplane": "Boeing",
+        "departure_time": "2030-01-01T13:00:00+00:00",
+        "arrival_time": "2030-01-01T16:00:00+00:00",
+    },
+    {
+        "source": "Lviv",
+        "destination": "Heathrow",
+        "airplane": "Boeing",
+        "departure_time": "2030-01-02T13:00:00+00:00",
+        "arrival_time": "2030-01-02T12:00:00+00:00",
+    },
+]
+
+
+class TestImportSchedule(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.paths = {
+            "airports": os.path.join(directory.name, "airports.csv"),
+            "airplanes": os.path.join(directory.name, "airplanes.ndjson"),
+            "routes": os.path.join(directory.name, "routes.csv"),
+            "crews": os.path.join(directory.name, "crews.csv"),
+            "flights": os.path.join(directory.name, "flights.ndjson"),
+        }
+        self.write("airports", AIRPORTS_CSV)
+        self.write("airplanes", AIRPLANES)
+        self.write("routes", ROUTES_CSV)
+        self.write("crews", CREWS_CSV)
+        self.write("flights", FLIGHTS)
+
+    def write(self, name, content):
+        if isinstance(content, list):
+            content = "".join(json.dumps(row) + "\n" for row in content)
+        with open(self.paths[name], "w") as file:
+            file.write(content)
+
+    def import_schedule(self, **options):
+        stdout = io.StringIO()
+        call_command(
+            "import_schedule",
+            batch_size=2,
+            stdout=stdout,
+            **self.paths,
+            **options
+        )
+        return stdout.getvalue()
+
+    def test_import_creates_valid_rows_and_reports_rejected(self):
+        output = self.import_schedule()
+
+        self.assertEqual(Airport.objects.count(), 3)
+        self.assertEqual(Airplane.objects.get().capacity, 60)
+        self.assertEqual(Route.objects.count(), 2)
+        self.assertEqual(Crew.objects.count(), 2)
+        self.assertEqual(Flight.objects.count(), 2)
+
+        flight = Flight.objects.get(route__source__name="Boryspil")
+        self.assertEqual(flight.crews.count(), 2)
+        self.assertEqual(flight.tickets_sold, 0)
+
+        self.assertIn("airports: 4 read, 3 inserted, 0 updated", output)
+        self.assertIn("routes: 4 read, 2 inserted, 0 updated", output)
+        self.assertIn("flights: 3 read, 2 inserted, 0 updated", output)
+        self.assertIn("1 rejected", output)
+
+    def test_reimport_is_idempotent(self):
+        self.import_schedule()
+        output = self.import_schedule()
+
+        self.assertEqual(Airport.objects.count(), 3)
+        self.assertEqual(Route.objects.count(), 2)
+        self.assertEqual(Flight.objects.count(), 2)
+        self.assertEqual(Flight.crews.through.objects.count(), 2)
+        self.assertIn("flights: 3 read, 0 inserted, 0 updated", output)
+
+    def test_reimport_updates_changed_rows_only(self):
+        self.import_schedule()
+        flight = Flight.objects.get(route__source__name="Lviv")
+        Flight.objects.filter(pk=flight.pk).update(tickets_sold=5)
+
+        self.write("routes", "source,destination,distance\nLviv,Heathrow,1900\n")
+        flights = [dict(FLIGHTS[1], arrival_time="2030-01-01T17:00:00Z")]
+        self.write("flights", flights)
+        output = self.import_schedule()
+
+        self.assertIn("routes: 1 read, 0 inserted, 1 updated", output)
+        self.assertIn("flights: 1 read, 0 inserted, 1 updated", output)
+        flight.refresh_from_db()
+        self.assertEqual(flight.route.distance, 1900)
+        self.assertEqual(flight.arrival_time.hour, 17)
+        self.assertEqual(flight.tickets_sold, 5)
+
+    def test_import_requires_a_file(self):
+        with self.assertRaises(CommandError):
+            call_command("import_schedule")
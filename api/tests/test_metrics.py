@@ -0,0 +1,149 @@
+import re
+import tempfile
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import metrics
+from api.tests.filters.test_airport_filter import sample_flight
+
+
+def sample(text, series):
+    match = re.search(rf"^airport_{re.escape(series)} (\S+)$", text, re.M)
+    return match and float(match.group(1))
+
+
+class TestMetricsEndpoint(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.memory_metrics.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_records_views_and_actions(self):
+        sample_flight(4)
+        self.client.get(reverse("api:flight-list"))
+        self.client.get(reverse("api:flight-list"))
+        self.client.post(reverse("api:order-list"), {}, format="json")
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        text = response.content.decode()
+
+        view = 'view="FlightViewSet.list"'
+        self.assertEqual(
+            sample(
+                text,
+                f'http_requests_total{{{view},method="GET",status="200"}}'
+            ),
+            2
+        )
+        self.assertEqual(
+            sample(
+                text,
+                'http_requests_total{view="OrderViewSet.create",'
+                'method="POST",status="400"}'
+            ),
+            1
+        )
+        self.assertEqual(
+            sample(text, f'http_request_duration_seconds_bucket{{{view},le="+Inf"}}'),
+            2
+        )
+        self.assertEqual(
+            sample(text, f"http_request_duration_seconds_count{{{view}}}"),
+            2
+        )
+        self.assertGreater(sample(text, f"db_queries_total{{{view}}}"), 0)
+        self.assertGreater(
+            sample(text, f"db_query_duration_seconds_total{{{view}}}"),
+            0
+        )
+        self.assertGreater(
+            sample(text, f"http_response_size_bytes_total{{{view}}}"),
+            0
+        )
+
+    async def test_records_async_views(self):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        response = await AsyncClient().get(
+            reverse("api:async-flight-list"),
+            headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
+
+        text = metrics.render(metrics.store().collect())
+        view = 'view="flight_list"'
+        self.assertEqual(
+            sample(
+                text,
+                f'http_requests_total{{{view},method="GET",status="200"}}'
+            ),
+            1
+        )
+        self.assertGreater(sample(text, f"db_queries_total{{{view}}}"), 0)
+
+    def test_async_capable(self):
+        async def get_response(request):
+            pass
+
+        self.assertTrue(
+            iscoroutinefunction(metrics.MetricsMiddleware(get_response))
+        )
+        self.assertFalse(
+            iscoroutinefunction(metrics.MetricsMiddleware(lambda request: None))
+        )
+
+    def test_staff_only(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@gmail.com",
+                password="password123e"
+            )
+        )
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+
+class TestMetricsStore(SimpleTestCase):
+    def test_processes_share_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/metrics.sqlite3"
+            first, second = metrics.SQLiteMetrics(path), metrics.SQLiteMetrics(path)
+            series = ("db_queries_total", 'view="FlightViewSet.list"')
+
+            first.add([(series, 3)])
+            second.add([(series, 2)])
+
+            self.assertEqual(first.collect(), {series: 5})
+
+    def test_histogram_buckets_are_cumulative(self):
+        view = 'view="FlightViewSet.list"'
+        text = metrics.render({
+            ("http_request_duration_seconds_bucket", f"{view},le=0.01"): 2,
+            ("http_request_duration_seconds_bucket", f"{view},le=+Inf"): 1,
+            ("http_request_duration_seconds_count", view): 3,
+            ("http_request_duration_seconds_sum", view): 12.5,
+        })
+
+        self.assertEqual(
+            [
+                sample(text, f'http_request_duration_seconds_bucket{{{view},le="{le}"}}')
+                for le in ("0.005", "0.01", "10", "+Inf")
+            ],
+            [0, 2, 2, 3]
+        )
+        self.assertEqual(
+            sample(text, f"http_request_duration_seconds_sum{{{view}}}"),
+            12.5
+        )
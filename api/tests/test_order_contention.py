@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+import unittest
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from cart.models import Ticket
+
+
+@unittest.skipUnless(
+    connection.features.has_select_for_update,
+    "Booking contention needs row locks"
+)
+class TestOrderContention(TransactionTestCase):
+    threads = 16
+    orders_per_thread = 8
+
+    def setUp(self):
+        airplane = Airplane.objects.create(
+            name="Airplane",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(name="Type")
+        )
+        self.flight = Flight.objects.create(
+            route=Route.objects.create(
+                source=Airport.objects.create(name="A", closest_big_city="A"),
+                destination=Airport.objects.create(
+                    name="B",
+                    closest_big_city="B"
+                ),
+                distance=1000
+            ),
+            airplane=airplane,
+            departure_time="2023-08-09T11:55:00Z",
+            arrival_time="2023-08-09T15:55:00Z"
+        )
+
+    def buyer(self, number, statuses):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                email=f"buyer{number}@gmail.com",
+                password="password123e",
+                is_staff=True
+            )
+        )
+        places = [(row, seat) for row in range(1, 11) for seat in range(1, 7)]
+        try:
+            for _ in range(self.orders_per_thread):
+                response = client.post(
+                    reverse("api:order-list"),
+                    {
+                        "tickets": [
+                            {"row": row, "seat": seat, "flight": self.flight.id}
+                            for row, seat in random.sample(
+                                places,
+                                random.randint(1, 3)
+                            )
+                        ]
+                    },
+                    format="json"
+                )
+                statuses.append(response.status_code)
+        finally:
+            connection.close()
+
+    def test_many_buyers_one_flight(self):
+        statuses = []
+        threads = [
+            threading.Thread(target=self.buyer, args=(number, statuses))
+            for number in range(self.threads)
+        ]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        counts = Counter(statuses)
+        print(
+            f"\n{len(statuses)} orders in {elapsed:.2f}s "
+            f"({len(statuses) / elapsed:.1f} orders/s), "
+            f"conflict rate {counts[409] / len(statuses):.0%}"
+            f", statuses {dict(counts)}"
+        )
+
+        self.assertEqual(self.threads * self.orders_per_thread, len(statuses))
+        self.assertLessEqual(set(counts), {201, 409})
+        self.flight.refresh_from_db()
+        self.assertEqual(
+            Ticket.objects.filter(flight=self.flight).count(),
+            self.flight.tickets_sold
+        )
@@ -0,0 +1,113 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.exceptions import PlacesTaken
+from api.serializers.cart_serializers import OrderSerializer
+from api.tests.filters.test_airport_filter import sample_flight
+from cart.models import Order, Ticket
+
+
+UNIQUE_ERROR = {
+    "non_field_errors": [
+        "The fields flight, row, seat must make a unique set."
+    ]
+}
+
+
+class TestOrderCreate(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(5)
+        self.url = reverse("api:order-list")
+
+    def book(self, places, flight=None):
+        return self.client.post(
+            self.url,
+            {
+                "tickets": [
+                    {"row": row, "seat": seat, "flight": (flight or self.flight).id}
+                    for row, seat in places
+                ]
+            },
+            format="json"
+        )
+
+    def test_queries_do_not_grow_with_tickets(self):
+        with CaptureQueriesContext(connection) as single:
+            response = self.book([(1, 1)])
+        self.assertEqual(response.status_code, 201)
+
+        with CaptureQueriesContext(connection) as group:
+            response = self.book(
+                [(row, seat) for row in range(2, 5) for seat in range(1, 4)]
+            )
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(len(single), len(group))
+        self.assertEqual(10, Ticket.objects.count())
+
+    def test_taken_place(self):
+        self.book([(1, 1)])
+
+        response = self.book([(1, 2), (1, 1)])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            [{"flight": self.flight.id, "row": 1, "seat": 1}],
+            response.data["taken_places"]
+        )
+        self.assertEqual(1, Order.objects.count())
+
+    def test_same_place_twice_in_order(self):
+        response = self.book([(1, 1), (1, 1)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual({"tickets": [{}, UNIQUE_ERROR]}, response.data)
+        self.assertEqual(0, Ticket.objects.count())
+
+    def test_place_out_of_airplane(self):
+        response = self.book([(1, 1), (10, 1)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("row", response.data["tickets"][1])
+
+    def test_unknown_flight(self):
+        response = self.client.post(
+            self.url,
+            {"tickets": [{"row": 1, "seat": 1, "flight": 0}]},
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("flight", response.data["tickets"][0])
+
+    def test_place_taken_after_validation(self):
+        serializer = OrderSerializer(
+            data={
+                "tickets": [
+                    {"row": 1, "seat": 1, "flight": self.flight.id},
+                    {"row": 1, "seat": 2, "flight": self.flight.id},
+                ]
+            }
+        )
+        self.assertTrue(serializer.is_valid())
+        self.book([(1, 2)])
+
+        with self.assertRaises(PlacesTaken) as error:
+            serializer.save(user=self.user)
+
+        self.assertEqual(
+            [{"flight": self.flight.id, "row": 1, "seat": 2}],
+            error.exception.detail["taken_places"]
+        )
+        self.assertEqual(1, Ticket.objects.count())
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Crew
+from api.tests.filters.test_airport_filter import sample_flight
+
+
+class TestOrderList(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse("api:order-list")
+        self.crew = Crew.objects.create(first_name="Ann", last_name="Crew")
+
+    def book(self, flights, places):
+        for flight in flights:
+            flight.crews.add(self.crew)
+        response = self.client.post(
+            self.url,
+            {
+                "tickets": [
+                    {"row": row, "seat": seat, "flight": flight.id}
+                    for flight in flights
+                    for row, seat in places
+                ]
+            },
+            format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_nested_flights(self):
+        flight = sample_flight(5)
+        self.book([flight], [(1, 1), (1, 2)])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        tickets = response.data["results"][0]["tickets"]
+        self.assertEqual(len(tickets), 2)
+        self.assertEqual(tickets[0]["flight"]["id"], flight.id)
+        self.assertEqual(
+            tickets[0]["flight"]["route_full_name"],
+            "Airport4->Airport4"
+        )
+        self.assertEqual(tickets[0]["flight"]["available_tickets"], 14)
+        self.assertEqual(tickets[0]["flight"]["airplane"], "Airplane4")
+        self.assertEqual(tickets[0]["flight"]["crews"], ["Ann Crew"])
+
+    def test_queries_do_not_grow_with_tickets(self):
+        self.book([sample_flight(3)], [(1, 1)])
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        for _ in range(3):
+            self.book(
+                [sample_flight(5) for _ in range(3)],
+                [(row, seat) for row in range(1, 4) for seat in range(1, 4)]
+            )
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 4)
+
+        self.assertEqual(len(single), len(many))
@@ -0,0 +1,448 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Route
+)
+from airport.search import flight_search_index
+from api.tests.query_budgets import (
+    endpoints,
+    query_budget,
+    QueryBudgetTestCase
+)
+from cart.models import Order, Ticket
+
+
+DEPARTURE = datetime.datetime(2023, 8, 9, 9, tzinfo=datetime.timezone.utc)
+
+# router api roots list urls without touching the database
+WITHOUT_BUDGET = {"APIRootView.get"}
+
+
+class TestQueryBudgets(QueryBudgetTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="admin@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.authenticate(self.user)
+
+    def airplanes(self, number):
+        return [
+            Airplane.objects.create(
+                name=f"Airplane{i}",
+                rows=10,
+                seats_in_row=6,
+                airplane_type=AirplaneType.objects.create(name=f"Type{i}")
+            )
+            for i in range(number)
+        ]
+
+    def airports(self, number):
+        return Airport.objects.bulk_create(
+            Airport(name=f"Airport{i}", closest_big_city=f"City{i}")
+            for i in range(number)
+        )
+
+    def routes(self, number):
+        airports = self.airports(number + 1)
+        return [
+            Route.objects.create(
+                source=source,
+                destination=destination,
+                distance=1000
+            )
+            for source, destination in zip(airports, airports[1:])
+        ]
+
+    def crews(self, number):
+        return Crew.objects.bulk_create(
+            Crew(first_name=f"First{i}", last_name=f"Last{i}")
+            for i in range(number)
+        )
+
+    def flights(self, number, crews=2):
+        routes, airplanes = self.routes(number), self.airplanes(number)
+        flights = []
+        for i, (route, airplane) in enumerate(zip(routes, airplanes)):
+            flight = Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_time=DEPARTURE + datetime.timedelta(hours=i),
+                arrival_time=DEPARTURE + datetime.timedelta(hours=i + 2)
+            )
+            flight.crews.set(self.crews(crews))
+            flights.append(flight)
+        return flights
+
+    def tickets(self, flight, number, order=None):
+        order = order or Order.objects.create(user=self.user)
+        return [
+            Ticket.objects.create(
+                row=i // 6 + 1,
+                seat=i % 6 + 1,
+                flight=flight,
+                order=order
+            )
+            for i in range(number)
+        ]
+
+    def flight_graph(self, related):
+        """
+        related flights of one airplane, route and crew, with tickets,
+        what deleting any of them cascades to
+        """
+        airplane, route = self.airplanes(1)[0], self.routes(1)[0]
+        crew = self.crews(1)[0]
+        flights = []
+        for i in range(related):
+            flight = Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_time=DEPARTURE + datetime.timedelta(hours=i),
+                arrival_time=DEPARTURE + datetime.timedelta(hours=i + 2)
+            )
+            flight.crews.add(crew)
+            self.tickets(flight, 2)
+            flights.append(flight)
+        return airplane, route, crew, flights
+
+    def write_setup(self, url_name, create, data=None):
+        """
+        Request to the detail url of the object create(related) returns,
+        data is a dict or a function of the object
+        """
+        def setup(related):
+            instance = create(related)
+            return (
+                reverse(url_name, args=[instance.pk]),
+                data(instance) if callable(data) else data
+            )
+        return setup
+
+    def create_setup(self, url_name, data):
+        """data is a function of related"""
+        def setup(related):
+            return reverse(url_name), data(related)
+        return setup
+
+    def flight_data(self, related):
+        route, airplane = self.routes(1)[0], self.airplanes(1)[0]
+        return {
+            "route": route.pk,
+            "airplane": airplane.pk,
+            "crews": [crew.pk for crew in self.crews(related)],
+            "departure_time": DEPARTURE,
+            "arrival_time": DEPARTURE + datetime.timedelta(hours=2),
+        }
+
+    def list_setup(self, url_name, create):
+        def setup(related):
+            create(related)
+            return reverse(url_name), None
+        return setup
+
+    def detail_setup(self, url_name, create):
+        def setup(related):
+            objects = create(related)
+            return reverse(url_name, args=[objects[0].pk]), None
+        return setup
+
+    def flight_setup(self, url_name):
+        """A flight with related crews and tickets"""
+        def setup(related):
+            flight = self.flights(1, crews=related)[0]
+            self.tickets(flight, related)
+            return reverse(url_name, args=[flight.pk]), None
+        return setup
+
+    def search_setup(self, related):
+        flight_search_index.clear()
+        source, destination = self.airports(2)
+        airplane = self.airplanes(1)[0]
+        route = Route.objects.create(
+            source=source,
+            destination=destination,
+            distance=1000
+        )
+        for i in range(related):
+            Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_time=DEPARTURE + datetime.timedelta(hours=i),
+                arrival_time=DEPARTURE + datetime.timedelta(hours=i + 2)
+            )
+        return (
+            reverse("api:flight-search")
+            + f"?from={source.pk}&to={destination.pk}&date=2023-08-09"
+        ), None
+
+    def flight_create_setup(self, related):
+        return reverse("api:flight-list"), self.flight_data(related)
+
+    def orders_setup(self, url_name):
+        """Orders with tickets of different flights"""
+        def setup(related):
+            for flight in self.flights(related):
+                self.tickets(flight, 2)
+            return reverse(url_name), None
+        return setup
+
+    def order_create_setup(self, related):
+        return reverse("api:order-list"), {
+            "tickets": [
+                {"row": 1, "seat": 1, "flight": flight.pk}
+                for flight in self.flights(related)
+            ]
+        }
+
+    def user_setup(self, url_name, data=None):
+        def setup(related):
+            return reverse(url_name), data
+        return setup
+
+    def scenarios(self):
+        token = str(self.access_token)
+        return {
+            "AirplaneTypeViewSet.list": ("get", self.list_setup(
+                "api:airplanetype-list",
+                lambda related: self.airplanes(related)
+            )),
+            "AirplaneTypeViewSet.retrieve": ("get", self.detail_setup(
+                "api:airplanetype-detail",
+                lambda related: [self.airplanes(related)[0].airplane_type]
+            )),
+            "AirplaneViewSet.list": ("get", self.list_setup(
+                "api:airplane-list",
+                self.airplanes
+            )),
+            "AirplaneViewSet.retrieve": ("get", self.detail_setup(
+                "api:airplane-detail",
+                self.airplanes
+            )),
+            "AirportViewSet.list": ("get", self.list_setup(
+                "api:airport-list",
+                self.airports
+            )),
+            "AirportViewSet.retrieve": ("get", self.detail_setup(
+                "api:airport-detail",
+                self.airports
+            )),
+            "RouteViewSet.list": ("get", self.list_setup(
+                "api:route-list",
+                self.routes
+            )),
+            "RouteViewSet.retrieve": ("get", self.detail_setup(
+                "api:route-detail",
+                self.routes
+            )),
+            "CrewViewSet.list": ("get", self.list_setup(
+                "api:crew-list",
+                lambda related: self.flights(related)
+            )),
+            "CrewViewSet.retrieve": ("get", self.detail_setup(
+                "api:crew-detail",
+                lambda related: self.flights(1, crews=related)[0].crews.all()
+            )),
+            "FlightViewSet.list": ("get", self.list_setup(
+                "api:flight-list",
+                self.flights
+            )),
+            "FlightViewSet.retrieve": (
+                "get",
+                self.flight_setup("api:flight-detail")
+            ),
+            "FlightViewSet.seatmap": (
+                "get",
+                self.flight_setup("api:flight-seatmap")
+            ),
+            "FlightViewSet.search": ("get", self.search_setup),
+            "FlightViewSet.create": ("post", self.flight_create_setup),
+            "FlightViewSet.update": ("put", self.write_setup(
+                "api:flight-detail",
+                lambda related: self.flights(1, crews=related)[0],
+                lambda flight: {
+                    "route": flight.route_id,
+                    "airplane": flight.airplane_id,
+                    "crews": [
+                        crew.pk for crew in self.crews(flight.crews.count())
+                    ],
+                    "departure_time": DEPARTURE,
+                    "arrival_time": DEPARTURE + datetime.timedelta(hours=3),
+                }
+            )),
+            "FlightViewSet.partial_update": ("patch", self.write_setup(
+                "api:flight-detail",
+                lambda related: self.flights(1, crews=related)[0],
+                lambda flight: {
+                    "crews": [
+                        crew.pk for crew in self.crews(flight.crews.count())
+                    ]
+                }
+            )),
+            "FlightViewSet.destroy": ("delete", self.write_setup(
+                "api:flight-detail",
+                lambda related: self.flight_graph(related)[3][0]
+            )),
+            "OrderViewSet.list": ("get", self.orders_setup("api:order-list")),
+            "OrderViewSet.create": ("post", self.order_create_setup),
+            "OrderViewSet.export": (
+                "get",
+                self.orders_setup("api:order-export")
+            ),
+            "flight_list": ("get", self.list_setup(
+                "api:async-flight-list",
+                self.flights
+            )),
+            "flight_detail": (
+                "get",
+                self.flight_setup("api:async-flight-detail")
+            ),
+            "flight_seatmap": (
+                "get",
+                self.flight_setup("api:async-flight-seatmap")
+            ),
+            "ManageUserView.get": ("get", self.user_setup("api:profile")),
+            "ManageUserView.put": ("put", self.user_setup(
+                "api:profile",
+                {"email": "renamed@gmail.com", "password": "password123e"}
+            )),
+            "ManageUserView.patch": ("patch", self.user_setup(
+                "api:profile",
+                {"email": "renamed@gmail.com"}
+            )),
+            "CacheStatsView.get": ("get", self.user_setup("api:cache_stats")),
+            "CreateUserView.post": ("post", self.user_setup(
+                "api:create",
+                {"email": "new@gmail.com", "password": "password123e"}
+            )),
+            "TokenObtainPairView.post": ("post", self.user_setup(
+                "api:token_obtain_pair",
+                {"email": "admin@gmail.com", "password": "password123e"}
+            )),
+            "TokenVerifyView.post": ("post", self.user_setup(
+                "api:token_verify",
+                {"token": token}
+            )),
+            "TokenRefreshView.post": ("post", self.user_setup(
+                "api:token_refresh",
+                {"refresh": str(RefreshToken.for_user(self.user))}
+            )),
+            **self.catalog_write_scenarios(),
+        }
+
+    def catalog_write_scenarios(self):
+        """create, update, partial_update and destroy of the catalog"""
+        def airplane_type(related):
+            return self.flight_graph(related)[0].airplane_type
+
+        def airplane(related):
+            return self.flight_graph(related)[0]
+
+        def airport(related):
+            return self.flight_graph(related)[1].source
+
+        def route(related):
+            return self.flight_graph(related)[1]
+
+        def crew(related):
+            return self.flight_graph(related)[2]
+
+        def airplane_data(instance):
+            return {
+                "name": "Renamed",
+                "rows": 20,
+                "seats_in_row": 6,
+                "airplane_type": instance.airplane_type_id,
+            }
+
+        def route_data(instance):
+            source, destination = self.airports(2)
+            return {
+                "source": source.pk,
+                "destination": destination.pk,
+                "distance": 2000,
+            }
+
+        catalog = {
+            "AirplaneTypeViewSet": (
+                "airplanetype",
+                airplane_type,
+                lambda instance: {"name": "Renamed"},
+                lambda instance: {"name": "Renamed"},
+            ),
+            "AirplaneViewSet": (
+                "airplane",
+                airplane,
+                airplane_data,
+                lambda instance: {"name": "Renamed"},
+            ),
+            "AirportViewSet": (
+                "airport",
+                airport,
+                lambda instance: {
+                    "name": "Renamed",
+                    "closest_big_city": "Renamed",
+                },
+                lambda instance: {"closest_big_city": "Renamed"},
+            ),
+            "RouteViewSet": ("route", route, route_data, route_data),
+            "CrewViewSet": (
+                "crew",
+                crew,
+                lambda instance: {"first_name": "A", "last_name": "B"},
+                lambda instance: {"last_name": "B"},
+            ),
+        }
+        scenarios = {}
+        for view, (basename, create, data, patch) in catalog.items():
+            detail = f"api:{basename}-detail"
+            scenarios.update({
+                f"{view}.create": ("post", self.create_setup(
+                    f"api:{basename}-list",
+                    lambda related, data=data, create=create: data(
+                        create(related)
+                    )
+                )),
+                f"{view}.update": ("put", self.write_setup(
+                    detail,
+                    create,
+                    data
+                )),
+                f"{view}.partial_update": ("patch", self.write_setup(
+                    detail,
+                    create,
+                    patch
+                )),
+                f"{view}.destroy": ("delete", self.write_setup(
+                    detail,
+                    create
+                )),
+            })
+        return scenarios
+
+    def test_every_endpoint_has_a_budget_and_a_scenario(self):
+        scenarios = self.scenarios()
+        for name, (callback, method) in endpoints().items():
+            if name in WITHOUT_BUDGET:
+                continue
+            with self.subTest(name):
+                self.assertIsNotNone(
+                    query_budget(callback, method),
+                    f"{name} declares no query budget"
+                )
+                self.assertIn(name, scenarios)
+
+    def test_endpoints_stay_within_budget(self):
+        for name, (method, setup) in self.scenarios().items():
+            with self.subTest(name):
+                self.assertQueryBudget(method, setup)
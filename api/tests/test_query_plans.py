@@ -0,0 +1,218 @@
+import re
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Route,
+)
+from cart.models import Order, Ticket
+
+
+LARGE_TABLES = {
+    "airport_flight",
+    "airport_flight_crews",
+    "cart_order",
+    "cart_ticket",
+}
+
+
+def seed(
+        airports=40,
+        flights=3000,
+        users=50,
+        orders_per_user=20,
+        tickets_per_order=10
+):
+    airplane_type = AirplaneType.objects.create(name="Type")
+    airplanes = Airplane.objects.bulk_create(
+        Airplane(
+            name=f"Airplane{i}",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=airplane_type
+        )
+        for i in range(10)
+    )
+    airports = Airport.objects.bulk_create(
+        Airport(name=f"Airport{i}", closest_big_city=f"City{i}")
+        for i in range(airports)
+    )
+    routes = Route.objects.bulk_create(
+        Route(source=source, destination=destination, distance=1000)
+        for source in airports
+        for destination in airports
+        if source != destination
+    )
+    crews = Crew.objects.bulk_create(
+        Crew(first_name=f"First{i}", last_name=f"Last{i}")
+        for i in range(100)
+    )
+
+    start = timezone.now()
+    flights = Flight.objects.bulk_create(
+        Flight(
+            route=routes[i % len(routes)],
+            airplane=airplanes[i % len(airplanes)],
+            departure_time=start + timezone.timedelta(minutes=10 * i),
+            arrival_time=start + timezone.timedelta(minutes=10 * i + 120)
+        )
+        for i in range(flights)
+    )
+    Flight.crews.through.objects.bulk_create(
+        Flight.crews.through(flight=flight, crew=crews[(i + j) % len(crews)])
+        for i, flight in enumerate(flights)
+        for j in range(3)
+    )
+
+    user_model = get_user_model()
+    users = user_model.objects.bulk_create(
+        user_model(email=f"user{i}@gmail.com") for i in range(users)
+    )
+    orders = Order.objects.bulk_create(
+        Order(user=user) for user in users for _ in range(orders_per_user)
+    )
+    Ticket.objects.bulk_create(
+        Ticket(
+            row=i // 6 % 30 + 1,
+            seat=i % 6 + 1,
+            flight=flights[i // 180],
+            order=orders[i // tickets_per_order]
+        )
+        for i in range(len(orders) * tickets_per_order)
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return users[0], flights[0]
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "Query plans are checked on PostgreSQL"
+)
+class TestQueryPlans(TestCase):
+    """
+    Every SELECT an endpoint runs is explained on seeded data and fails
+    on a Seq Scan of a large table. Unfiltered counts read whole tables
+    by definition and are not checked.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.flight = seed()
+        cls.user.is_staff = True
+        cls.user.save()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @staticmethod
+    def explain(sql, disable_seqscan):
+        with connection.cursor() as cursor:
+            if disable_seqscan:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN " + sql)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            if disable_seqscan:
+                cursor.execute("SET LOCAL enable_seqscan = on")
+        return plan
+
+    def assertIndexedPlans(
+            self,
+            url,
+            params=None,
+            tables=LARGE_TABLES,
+            disable_seqscan=False
+    ):
+        """
+        disable_seqscan checks tables too small for the planner to prefer
+        an index, a Seq Scan left then means no index can serve the query
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+
+        for query in queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT") or (
+                sql.startswith("SELECT COUNT(*)") and " WHERE " not in sql
+            ):
+                continue
+            plan = self.explain(sql, disable_seqscan)
+            scans = set(re.findall(r"Seq Scan on (\w+)", plan)) & tables
+            self.assertFalse(
+                scans,
+                f"Sequential scan on {', '.join(scans)}:\n{sql}\n{plan}"
+            )
+
+    def test_flight_list(self):
+        self.assertIndexedPlans(reverse("api:flight-list"))
+
+    def test_flight_list_cursor(self):
+        self.assertIndexedPlans(
+            reverse("api:flight-list"),
+            {"pagination": "cursor"}
+        )
+
+    def test_flight_list_route_destination(self):
+        route = self.flight.route
+        self.assertIndexedPlans(
+            reverse("api:flight-list"),
+            {"route_destination": f"{route.source_id},{route.destination_id}"}
+        )
+
+    def test_flight_list_departure_time(self):
+        self.assertIndexedPlans(
+            reverse("api:flight-list"),
+            {"departure_time": self.flight.departure_time.isoformat()}
+        )
+
+    def test_flight_list_airplane(self):
+        self.assertIndexedPlans(
+            reverse("api:flight-list"),
+            {"airplane": self.flight.airplane_id}
+        )
+
+    def test_flight_detail(self):
+        self.assertIndexedPlans(
+            reverse("api:flight-detail", args=[self.flight.id])
+        )
+
+    def test_flight_seatmap(self):
+        self.assertIndexedPlans(
+            reverse("api:flight-seatmap", args=[self.flight.id])
+        )
+
+    def test_order_list(self):
+        self.assertIndexedPlans(reverse("api:order-list"))
+
+    def test_order_list_created_at(self):
+        order = self.user.orders.first()
+        self.assertIndexedPlans(
+            reverse("api:order-list"),
+            {"created_at": order.created_at.isoformat()}
+        )
+
+    def test_crew_list(self):
+        self.assertIndexedPlans(reverse("api:crew-list"))
+
+    def test_airport_list_closest_big_city(self):
+        self.assertIndexedPlans(
+            reverse("api:airport-list"),
+            {"closest_big_city": "city7"},
+            tables={"airport_airport"},
+            disable_seqscan=True
+        )
@@ -0,0 +1,165 @@
+import time
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections, OperationalError
+from django.db.utils import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.test import (
+    override_settings,
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import Flight
+from airport_service import replicas
+from api.tests.filters.test_airport_filter import sample_flight
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class TestReplicaRouting(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        replicas.unavailable_until.clear()
+        self.factory = RequestFactory()
+        self.router = replicas.PrimaryReplicaRouter()
+        self.user = get_user_model()(pk=1, email="user@gmail.com")
+        self.connections = {
+            DEFAULT_DB_ALIAS: connections[DEFAULT_DB_ALIAS],
+            "replica": mock.Mock(),
+        }
+        patcher = mock.patch.object(
+            replicas,
+            "connections",
+            self.connections
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request(self, method, status=200, user=None):
+        """Alias a read would use while the request is handled"""
+        used = []
+
+        def view(request):
+            used.append(self.router.db_for_read(Flight))
+            request.user = user or self.user
+            return HttpResponse(status=status)
+
+        headers = {}
+        if user is None:
+            headers["Authorization"] = f"Bearer {AccessToken.for_user(self.user)}"
+        request = getattr(self.factory, method)("/", headers=headers)
+        replicas.ReplicaRoutingMiddleware(view)(request)
+        return used[0]
+
+    def test_async_requests(self):
+        used = []
+
+        async def view(request):
+            used.append(self.router.db_for_read(Flight))
+            return HttpResponse()
+
+        middleware = replicas.ReplicaRoutingMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+        request = self.factory.get(
+            "/",
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        )
+        async_to_sync(middleware)(request)
+        self.assertEqual(used, ["replica"])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_not_used_without_replicas(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            replicas.ReplicaRoutingMiddleware(lambda request: None)
+
+    def test_safe_methods_read_from_replica(self):
+        self.assertEqual(self.request("get"), "replica")
+        self.assertEqual(self.request("head"), "replica")
+        self.assertEqual(self.request("post"), DEFAULT_DB_ALIAS)
+        self.assertEqual(
+            self.router.db_for_read(Flight),
+            DEFAULT_DB_ALIAS
+        )
+
+    def test_user_reads_own_writes_from_primary(self):
+        self.request("post", status=400)
+        self.assertEqual(self.request("get"), "replica")
+
+        self.request("post", status=201)
+        self.assertEqual(self.request("get"), DEFAULT_DB_ALIAS)
+
+        other = get_user_model()(pk=2, email="other@gmail.com")
+        self.assertEqual(self.request("get", user=other), "replica")
+
+        cache.clear()
+        self.assertEqual(self.request("get"), "replica")
+
+    def test_transactions_read_from_primary(self):
+        with mock.patch.object(
+            connections[DEFAULT_DB_ALIAS],
+            "in_atomic_block",
+            True
+        ):
+            self.assertEqual(self.request("get"), DEFAULT_DB_ALIAS)
+
+    def test_unavailable_replica_falls_back_to_primary(self):
+        replica = self.connections["replica"]
+        replica.ensure_connection.side_effect = OperationalError
+
+        self.assertEqual(self.request("get"), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.request("get"), DEFAULT_DB_ALIAS)
+        self.assertEqual(replica.ensure_connection.call_count, 1)
+
+        replica.ensure_connection.side_effect = None
+        replicas.unavailable_until["replica"] = time.monotonic()
+        self.assertEqual(self.request("get"), "replica")
+
+
+@skipUnless(
+    settings.DATABASE_REPLICAS,
+    "Set POSTGRES_REPLICA_HOSTS to test against a second database"
+)
+class TestReplicaDatabases(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="admin@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.client = APIClient(
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        )
+        self.flight = sample_flight(4)
+        self.replica = connections[settings.DATABASE_REPLICAS[0]]
+
+    def test_reads_go_to_replica_until_user_writes(self):
+        with CaptureQueriesContext(self.replica) as queries:
+            response = self.client.get(reverse("api:flight-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queries)
+
+        response = self.client.post(
+            reverse("api:order-list"),
+            {"tickets": [{"row": 1, "seat": 1, "flight": self.flight.id}]},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+        with CaptureQueriesContext(self.replica) as queries:
+            response = self.client.get(reverse("api:order-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(queries)
@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Airport, Crew
+from api.tests.filters.test_airport_filter import sample_airport, sample_flight
+
+
+class TestResponseCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_hit_skips_database(self):
+        sample_airport(3)
+        url = reverse("api:airport-list")
+
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+
+        self.assertEqual("MISS", first["X-Cache"])
+        self.assertEqual("HIT", second["X-Cache"])
+        self.assertEqual(first.data, second.data)
+
+    def test_query_params_are_part_of_key(self):
+        sample_airport(3)
+        url = reverse("api:airport-list")
+
+        self.client.get(url, {"closest_big_city": "City1"})
+        response = self.client.get(url, {"closest_big_city": "City2"})
+
+        self.assertEqual("MISS", response["X-Cache"])
+        self.assertEqual("City2", response.data["results"][0]["closest_big_city"])
+
+    def test_write_invalidates(self):
+        airport = sample_airport(1)
+        url = reverse("api:airport-detail", args=[airport.id])
+        self.client.get(url)
+
+        self.client.patch(url, {"name": "Renamed"})
+        response = self.client.get(url)
+
+        self.assertEqual("MISS", response["X-Cache"])
+        self.assertEqual("Renamed", response.data["name"])
+
+    def test_related_model_write_invalidates(self):
+        flight = sample_flight(2)
+        url = reverse("api:route-list")
+        self.client.get(url)
+
+        Airport.objects.filter(pk=flight.route.source_id).first().save()
+        response = self.client.get(url)
+
+        self.assertEqual("MISS", response["X-Cache"])
+
+    def test_m2m_change_invalidates(self):
+        flight = sample_flight(2)
+        crew = Crew.objects.create(first_name="First", last_name="Last")
+        url = reverse("api:crew-detail", args=[crew.id])
+        self.client.get(url)
+
+        flight.crews.add(crew)
+        response = self.client.get(url)
+
+        self.assertEqual("MISS", response["X-Cache"])
+        self.assertEqual(1, response.data["flights_count"])
+
+    def test_stats(self):
+        url = reverse("api:airplanetype-list")
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(url)
+
+        response = self.client.get(reverse("api:cache_stats"))
+
+        self.assertEqual({"hits": 2, "misses": 1}, response.data)
+
+    def test_stats_staff_only(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.get(reverse("api:cache_stats"))
+
+        self.assertEqual(response.status_code, 403)
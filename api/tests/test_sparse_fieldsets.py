@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Crew
+from api.tests.filters.test_airport_filter import sample_flight
+
+
+class TestSparseFieldsets(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(5)
+        self.flight.crews.add(
+            Crew.objects.create(first_name="Ann", last_name="Crew")
+        )
+
+    def test_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("api:flight-list"),
+                {"fields": "id,departure_time,available_tickets"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "departure_time", "available_tickets"}
+        )
+        self.assertEqual(response.data["results"][0]["available_tickets"], 16)
+
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertNotIn("airport_crew", sql)
+        self.assertNotIn("airport_airport", sql)
+        self.assertNotIn('"arrival_time"', sql)
+
+    def test_omit(self):
+        response = self.client.get(
+            reverse("api:flight-list"),
+            {"omit": "crews,airplane"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {
+                "id",
+                "departure_time",
+                "arrival_time",
+                "route_full_name",
+                "available_tickets"
+            }
+        )
+
+    def test_cursor_pagination(self):
+        later = sample_flight(5)
+        response = self.client.get(
+            reverse("api:flight-list"),
+            {"fields": "id", "pagination": "cursor"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.flight.id}, {"id": later.id}]
+        )
+
+    def test_nested_fields_of_detail(self):
+        response = self.client.get(
+            reverse("api:flight-detail", args=[self.flight.id]),
+            {"fields": "id,route"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {"id", "route"})
+        self.assertEqual(
+            response.data["route"]["source"]["name"],
+            "Airport4"
+        )
+
+    def test_annotation_omitted(self):
+        response = self.client.get(
+            reverse("api:crew-list"),
+            {"fields": "first_name"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], [{"first_name": "Ann"}])
+
+    def test_order_list(self):
+        response = self.client.get(
+            reverse("api:order-list"),
+            {"omit": "tickets"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_field(self):
+        response = self.client.get(
+            reverse("api:flight-list"),
+            {"fields": "id,price"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.data)
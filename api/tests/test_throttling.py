@@ -0,0 +1,118 @@
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import override_settings, RequestFactory, SimpleTestCase
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.throttling import SlidingWindowThrottle, SQLiteCounters
+
+
+RATES = {
+    "user": "2/min",
+    "search": "3/min",
+    "booking": "1/min",
+    "auth": "2/min",
+}
+START = 60 * 30_000_000
+
+
+class Scope:
+    def __init__(self, throttle_scope):
+        self.throttle_scope = throttle_scope
+
+
+@mock.patch.object(SlidingWindowThrottle, "THROTTLE_RATES", RATES)
+class TestSlidingWindowThrottle(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = f"{directory.name}/throttle.sqlite3"
+        self.enterContext(override_settings(THROTTLE_SQLITE_PATH=self.path))
+
+        self.request = RequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        self.request.user = AnonymousUser()
+        self.now = START
+
+    def allow(self, view=None):
+        self.throttle = SlidingWindowThrottle()
+        with mock.patch.object(
+            SlidingWindowThrottle,
+            "timer",
+            mock.Mock(return_value=self.now)
+        ):
+            return self.throttle.allow_request(self.request, view)
+
+    def test_limits_rate_of_scope(self):
+        self.assertEqual([self.allow() for _ in range(3)], [True, True, False])
+        self.assertEqual(self.throttle.wait(), 60)
+
+        self.assertEqual(
+            [self.allow(Scope("search")) for _ in range(4)],
+            [True, True, True, False]
+        )
+
+        self.request.user = get_user_model()(pk=1)
+        self.assertTrue(self.allow())
+
+    def test_previous_window_slides_out(self):
+        self.allow()
+        self.allow()
+
+        self.now = START + 75
+        self.assertTrue(self.allow())
+        self.assertFalse(self.allow())
+        self.assertEqual(self.throttle.wait(), 15)
+
+        self.now = START + 91
+        self.assertTrue(self.allow())
+
+    def test_processes_share_counters(self):
+        self.allow()
+        other_process = SQLiteCounters(self.path)
+        key = f"throttle:user:10.0.0.1:{START // 60}"
+
+        self.assertEqual(other_process.get_many([key]), {key: 1})
+        other_process.incr(key, timeout=120)
+        self.assertFalse(self.allow())
+
+
+@mock.patch.object(SlidingWindowThrottle, "THROTTLE_RATES", RATES)
+class TestThrottleScopes(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@gmail.com",
+            password="password123e",
+            is_staff=True
+        )
+
+    def test_auth_endpoints_are_limited_by_ip(self):
+        url = reverse("api:token_obtain_pair")
+        credentials = {"email": "user@gmail.com", "password": "password123e"}
+
+        self.assertEqual(self.client.post(url, credentials).status_code, 200)
+        self.assertEqual(self.client.post(url, credentials).status_code, 200)
+        response = self.client.post(url, credentials)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_search_and_booking_do_not_use_user_rate(self):
+        self.client.force_authenticate(self.user)
+        flights = reverse("api:flight-list")
+        orders = reverse("api:order-list")
+
+        for _ in range(3):
+            self.assertEqual(self.client.get(flights).status_code, 200)
+        self.assertEqual(self.client.get(flights).status_code, 429)
+
+        self.assertEqual(self.client.post(orders).status_code, 400)
+        self.assertEqual(self.client.post(orders).status_code, 429)
+
+        self.assertEqual(self.client.get(orders).status_code, 200)
@@ -0,0 +1,152 @@
+import functools
+import random
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class CacheCounters:
+    """
+    Counters in the default cache, shared by worker processes only
+    when the cache is (memcached, redis, database)
+    """
+
+    def get_many(self, keys):
+        return cache.get_many(keys)
+
+    def incr(self, key, timeout):
+        if not cache.add(key, 1, timeout=timeout):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, 1, timeout=timeout)
+
+
+class SQLiteCounters:
+    """
+    Counters in a SQLite file, every worker process on the host sees the
+    same numbers and an increment is a single atomic upsert
+    """
+
+    prune_probability = 0.01
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+    def connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=5,
+                isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle_counters ("
+                "key TEXT PRIMARY KEY, "
+                "count INTEGER NOT NULL, "
+                "expires REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self.local.connection = connection
+        return connection
+
+    def get_many(self, keys):
+        rows = self.connection().execute(
+            "SELECT key, count FROM throttle_counters "
+            f"WHERE key IN ({', '.join('?' * len(keys))}) AND expires > ?",
+            (*keys, time.time())
+        )
+        return dict(rows)
+
+    def incr(self, key, timeout):
+        now = time.time()
+        connection = self.connection()
+        connection.execute(
+            "INSERT INTO throttle_counters VALUES (?, 1, ?) "
+            "ON CONFLICT(key) DO UPDATE SET count = count + 1",
+            (key, now + timeout)
+        )
+        if random.random() < self.prune_probability:
+            connection.execute(
+                "DELETE FROM throttle_counters WHERE expires <= ?",
+                (now,)
+            )
+
+
+@functools.lru_cache(maxsize=None)
+def sqlite_counters(path):
+    return SQLiteCounters(path)
+
+
+def counters():
+    if settings.THROTTLE_SQLITE_PATH:
+        return sqlite_counters(settings.THROTTLE_SQLITE_PATH)
+    return CacheCounters()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Rate of view.throttle_scope ("user" when the view has none) per user,
+    or per ip for anonymous requests.
+
+    Keeps one counter per fixed window and weighs the previous window by
+    how much of it still overlaps the sliding one, a check reads two
+    counters and bumps one, whatever the rate.
+    """
+
+    scope = "user"
+
+    def __init__(self):
+        # the rate depends on the view, see allow_request
+        pass
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return f"throttle:{self.scope}:{ident}"
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None) or self.scope
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        window, self.elapsed = divmod(self.timer(), self.duration)
+        current_key = f"{key}:{int(window)}"
+        previous_key = f"{key}:{int(window) - 1}"
+
+        store = counters()
+        counts = store.get_many([current_key, previous_key])
+        self.current = counts.get(current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+
+        weight = (self.duration - self.elapsed) / self.duration
+        if self.previous * weight + self.current >= self.num_requests:
+            return False
+        store.incr(current_key, timeout=2 * self.duration)
+        return True
+
+    def wait(self):
+        if self.current >= self.num_requests:
+            # this window becomes the previous one of the next window
+            return (
+                self.duration - self.elapsed
+                + self.duration * (1 - self.num_requests / self.current)
+            )
+        return (
+            self.duration
+            * (1 - (self.num_requests - self.current) / self.previous)
+            - self.elapsed
+        )
@@ -2,15 +2,12 @@ from django.urls import path, include
 
 from rest_framework import routers
 
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-    TokenVerifyView
-)
-
 from api.views.account_views import (
     CreateUserView,
     ManageUserView,
+    TokenObtainPairView,
+    TokenRefreshView,
+    TokenVerifyView,
 )
 from api.views.airport_views import (
     AirplaneTypeViewSet,
@@ -20,6 +17,12 @@ from api.views.airport_views import (
     CrewViewSet,
     FlightViewSet,
 )
+from api.views.async_views import (
+    flight_list,
+    flight_detail,
+    flight_seatmap,
+)
+from api.views.cache_views import CacheStatsView
 from api.views.cart_views import (
     OrderViewSet
 )
@@ -67,10 +70,30 @@ urlpatterns = [
         "airport/",
         include(router_airport.urls)
     ),
+    path(
+        "airport/async/flights/",
+        flight_list,
+        name="async-flight-list"
+    ),
+    path(
+        "airport/async/flights/<int:pk>/",
+        flight_detail,
+        name="async-flight-detail"
+    ),
+    path(
+        "airport/async/flights/<int:pk>/seatmap/",
+        flight_seatmap,
+        name="async-flight-seatmap"
+    ),
     path(
         "cart/",
         include(router_cart.urls)
-    )
+    ),
+    path(
+        "cache/stats/",
+        CacheStatsView.as_view(),
+        name="cache_stats"
+    ),
 ]
 
 app_name = "api"
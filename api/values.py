@@ -0,0 +1,149 @@
+import functools
+
+from django.core.exceptions import FieldError, ImproperlyConfigured
+from django.db.models import F
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from api.fieldsets import SparseFieldsetsMixin
+
+
+# to_representation of these returns database values unchanged
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
+
+
+def is_identity(field):
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return field.pk_field is None
+    return type(field) in IDENTITY_FIELDS
+
+
+class ValuesRenderer:
+    """
+    Renders rows of queryset.values() exactly like serializer_class
+    renders model instances. Plain fields are read from the values of
+    their source path, many related fields from one query per page.
+    The row-to-dict function is generated once from the declared fields.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        self.model = serializer_class.Meta.model
+        self.pk = self.model._meta.pk.attname
+        self.paths = [self.pk]
+        self.relations = []
+
+        namespace, items = {}, []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if fields is not None and name not in fields:
+                continue
+            if field.source == "*" or isinstance(
+                field,
+                (serializers.BaseSerializer, serializers.SerializerMethodField)
+            ):
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} can't be rendered "
+                    "from values"
+                )
+
+            if isinstance(field, serializers.ManyRelatedField):
+                key = f"relation_{len(self.relations)}"
+                self.relations.append((key, field))
+                items.append(f"{name!r}: {key}.get(row[{self.pk!r}], [])")
+                continue
+
+            path = "__".join(field.source_attrs)
+            if path not in self.paths:
+                self.paths.append(path)
+            value = f"row[{path!r}]"
+            if is_identity(field):
+                items.append(f"{name!r}: {value}")
+            else:
+                key = f"convert_{len(namespace)}"
+                namespace[key] = field.to_representation
+                items.append(
+                    f"{name!r}: None if {value} is None else {key}({value})"
+                )
+
+        self.namespace = namespace
+        self.source = (
+            f"lambda row, {', '.join(key for key, _ in self.relations)}: "
+            if self.relations else "lambda row: "
+        ) + "{" + ", ".join(items) + "}"
+        self.render_row = eval(self.source, namespace)
+
+    def values(self, queryset, extra=()):
+        """Rows with the paths of the fields and extra fields"""
+        return queryset.prefetch_related(None).values(
+            *self.paths,
+            *(path for path in extra if path not in self.paths)
+        )
+
+    def related(self, field, pks):
+        """Representations of related objects by pk of their row"""
+        model_field = self.model._meta.get_field(field.source)
+        if model_field.many_to_many and not model_field.auto_created:
+            lookup = model_field.related_query_name()
+        else:
+            lookup = model_field.field.name
+
+        child = field.child_relation
+        related = {}
+        for instance in model_field.related_model._default_manager.filter(
+                **{f"{lookup}__in": pks}
+        ).annotate(_values_parent=F(lookup)):
+            related.setdefault(instance._values_parent, []).append(
+                child.to_representation(instance)
+            )
+        return related
+
+    def render(self, rows):
+        rows = list(rows)
+        if not self.relations:
+            return [self.render_row(row) for row in rows]
+
+        pks = [row[self.pk] for row in rows]
+        related = [
+            self.related(field, pks) if pks else {}
+            for _, field in self.relations
+        ]
+        return [self.render_row(row, *related) for row in rows]
+
+
+@functools.lru_cache(maxsize=256)
+def values_renderer(serializer_class, fields=None):
+    """fields is a frozenset of the names to render, None for all"""
+    return ValuesRenderer(serializer_class, fields)
+
+
+class ValuesListMixin(SparseFieldsetsMixin):
+    """
+    Lists through queryset.values() and a ValuesRenderer of the list
+    serializer, no model instances or field objects per row
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        renderer = values_renderer(
+            serializer_class,
+            self.get_sparse_fields(serializer_class)
+        )
+        try:
+            queryset = renderer.values(
+                self.filter_queryset(self.get_queryset()),
+                self.get_ordering_fields()
+            )
+        except FieldError:
+            # an annotation the serializer reads is missing on this backend
+            return super().list(request, *args, **kwargs)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(renderer.render(page))
+        return Response(renderer.render(queryset))
@@ -1,6 +1,7 @@
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt import views as jwt_views
 
 from api.serializers.account_serializers import UserSerializer
 
@@ -8,12 +9,30 @@ from api.serializers.account_serializers import UserSerializer
 @extend_schema(tags=["Accounts"])
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
+    throttle_scope = "auth"
+    query_budgets = {"post": 3}
 
 
 @extend_schema(tags=["Accounts"])
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated, )
+    query_budgets = {"get": 1, "put": 4, "patch": 3}
 
     def get_object(self):
         return self.request.user
+
+
+class TokenObtainPairView(jwt_views.TokenObtainPairView):
+    throttle_scope = "auth"
+    query_budgets = {"post": 1}
+
+
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    throttle_scope = "auth"
+    query_budgets = {"post": 0}
+
+
+class TokenVerifyView(jwt_views.TokenVerifyView):
+    throttle_scope = "auth"
+    query_budgets = {"post": 0}
@@ -1,10 +1,24 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from django.db.models import F, Value, Count
-from django.db.models.functions import Concat
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.db import connection
+from django.db.models import (
+    CharField,
+    F,
+    Value,
+    Count,
+    Max,
+    OuterRef,
+    Subquery
+)
+from django.db.models.functions import Coalesce, Concat
+from django.http import HttpResponse
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from airport.models import (
     AirplaneType,
@@ -14,13 +28,22 @@ from airport.models import (
     Crew,
     Flight
 )
+from airport.search import flight_search_index
+from cart.models import Ticket
 
+from api.cache import CachedResponseMixin, conditional, model_versions
+from api.fieldsets import SparseFieldsetsMixin
 from api.filters.airport_filters import (
     FlightFilter,
     AirportFilter,
     AirplaneFilter
 )
 
+from api.pagination import (
+    CursorPaginationMixin,
+    EstimatedCountPagination,
+    FlightCursorPagination
+)
 from api.permissions import IsAdminOrIfAuthenticatedReadOnly
 from api.serializers.airport_serializers import (
     AirplaneTypeSerializer,
@@ -35,23 +58,118 @@ from api.serializers.airport_serializers import (
     FlightSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
+    FlightSeatMapSerializer,
+    FlightSearchSerializer,
+    ItinerarySerializer,
     CrewDetailSerializer,
 )
+from api.values import ValuesListMixin
+
+
+def crew_names():
+    """
+    Display names of the flight crews in Crew ordering, an empty array
+    for flights without crews
+    """
+    return Coalesce(
+        Subquery(
+            Flight.crews.through.objects.filter(
+                flight=OuterRef("pk")
+            ).order_by().values(
+                "flight"
+            ).annotate(
+                names=ArrayAgg(
+                    Concat(
+                        F("crew__first_name"),
+                        Value(" "),
+                        F("crew__last_name")
+                    ),
+                    ordering=("crew__first_name", )
+                )
+            ).values("names")
+        ),
+        Value([]),
+        output_field=ArrayField(CharField())
+    )
+
+
+def flight_list_queryset(fields=None):
+    """
+    Flights with everything FlightListSerializer renders, also the
+    queryset of flights prefetched under order tickets. Postgres
+    aggregates crew names in the same query, other backends prefetch
+    crews for CrewNamesField. fields limits the annotations to the
+    ones of these serializer fields, all by default
+    """
+    if fields is None:
+        fields = FlightListSerializer.Meta.fields
+
+    queryset = Flight.objects.select_related(
+        "airplane",
+        "route__destination",
+        "route__source"
+    )
+    if "route_full_name" in fields:
+        queryset = queryset.annotate(
+            route_full_name=Concat(
+                F("route__source__name"),
+                Value("->"),
+                F("route__destination__name")
+            )
+        )
+    if "available_tickets" in fields:
+        queryset = queryset.annotate(
+            available_tickets=(
+                F("airplane__seats_in_row") * F("airplane__rows")
+                - F("tickets_sold")
+            )
+        )
+    if "crews" not in fields:
+        return queryset
+    if connection.vendor == "postgresql":
+        return queryset.annotate(crew_names=crew_names())
+    return queryset.prefetch_related("crews")
 
 
 @extend_schema(tags=["AirplaneTypes"])
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(
+    CachedResponseMixin,
+    SparseFieldsetsMixin,
+    viewsets.ModelViewSet
+):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (AirplaneType, )
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 3,
+        "update": 4,
+        "partial_update": 4,
+        "destroy": 12,
+    }
 
 
 @extend_schema(tags=["Airplanes"])
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(
+    CachedResponseMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet
+):
     queryset = Airplane.objects.all()
     serializer_class = AirplaneListSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     filterset_class = AirplaneFilter
+    cache_models = (Airplane, AirplaneType)
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 3,
+        "update": 4,
+        "partial_update": 3,
+        "destroy": 10,
+    }
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -81,11 +199,24 @@ class AirplaneViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema(tags=["Airports"])
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(
+    CachedResponseMixin,
+    SparseFieldsetsMixin,
+    viewsets.ModelViewSet
+):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     filterset_class = AirportFilter
+    cache_models = (Airport, )
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 2,
+        "update": 3,
+        "partial_update": 3,
+        "destroy": 13,
+    }
 
     @extend_schema(
         parameters=[
@@ -103,10 +234,23 @@ class AirportViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema(tags=["Routes"])
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(
+    CachedResponseMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet
+):
     queryset = Route.objects.all()
     serializer_class = RouteSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Route, Airport)
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 6,
+        "update": 7,
+        "partial_update": 7,
+        "destroy": 10,
+    }
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -122,10 +266,23 @@ class RouteViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema(tags=["Crews"])
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(
+    CachedResponseMixin,
+    SparseFieldsetsMixin,
+    viewsets.ModelViewSet
+):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly, )
+    cache_models = (Crew, Flight)
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 2,
+        "update": 3,
+        "partial_update": 3,
+        "destroy": 6,
+    }
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
@@ -134,45 +291,79 @@ class CrewViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         if self.action in ("list", "retrieve"):
+            # counted per crew of the page through the crew_id index
+            # instead of aggregating the whole flight_crews table
             return self.queryset.annotate(
-                flights_count=Count("flights")
+                flights_count=Coalesce(
+                    Subquery(
+                        Flight.crews.through.objects.filter(
+                            crew=OuterRef("pk")
+                        ).order_by().values(
+                            "crew"
+                        ).annotate(
+                            count=Count("pk")
+                        ).values("count")
+                    ),
+                    0
+                )
             )
         return self.queryset
 
 
 @extend_schema(tags=["Flights"])
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightViewSet(
+    CursorPaginationMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet
+):
     queryset = Flight.objects.all()
     serializer_class = FlightSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly, )
     filterset_class = FlightFilter
+    pagination_class = EstimatedCountPagination
+    cursor_pagination_class = FlightCursorPagination
+    query_budgets = {
+        "list": 4,
+        "retrieve": 6,
+        "seatmap": 3,
+        "search": 3,
+        "create": 9,
+        "update": 12,
+        "partial_update": 10,
+        "destroy": 7,
+    }
+
+    def get_throttles(self):
+        if self.action in ("list", "search"):
+            self.throttle_scope = "search"
+        return super().get_throttles()
 
     def get_serializer_class(self):
         if self.action == "list":
             return FlightListSerializer
         if self.action == "retrieve":
             return FlightDetailSerializer
+        if self.action == "seatmap":
+            return FlightSeatMapSerializer
+        if self.action == "search":
+            return ItinerarySerializer
         return FlightSerializer
 
     def get_queryset(self):
-        if self.action in ("retrieve", "list"):
+        if self.action == "list":
+            return flight_list_queryset(
+                self.get_sparse_fields(FlightListSerializer)
+            )
+        if self.action == "retrieve":
             return Flight.objects.prefetch_related(
                 "crews",
             ).select_related(
                 "airplane",
                 "route__destination",
                 "route__source"
-            ).annotate(
-                route_full_name=Concat(
-                    F("route__source__name"),
-                    Value("->"),
-                    F("route__destination__name")
-                ),
-                available_tickets=(
-                    F("airplane__seats_in_row") * F("airplane__rows")
-                    - Count("tickets")
-                )
             )
+        if self.action == "seatmap":
+            return Flight.objects.select_related("airplane")
         return Flight.objects.all()
 
     @extend_schema(
@@ -196,8 +387,146 @@ class FlightViewSet(viewsets.ModelViewSet):
                 type=int,
                 description="Filter by airplane (ex.?airplane=1)",
                 required=False
+            ),
+            OpenApiParameter(
+                "pagination",
+                type=str,
+                enum=["cursor"],
+                description="Paginate by (departure_time, id) cursor "
+                            "instead of page number (ex.?pagination=cursor)",
+                required=False
             )
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    def get_etag_version(self, request, pk=None):
+        """
+        Ticket ids only grow, so the count and max id of flight tickets
+        change with every booked or released place
+        """
+        try:
+            flight_id = int(pk)
+        except ValueError:
+            return None
+
+        tickets = Ticket.objects.filter(flight_id=flight_id).aggregate(
+            count=Count("id"),
+            last=Max("id")
+        )
+        return (
+            flight_id,
+            model_versions(
+                (Flight, Route, Airport, Airplane, AirplaneType, Crew)
+            ),
+            tickets["count"],
+            tickets["last"]
+        )
+
+    @conditional
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "encoding",
+                type=str,
+                enum=["base64", "binary"],
+                description="Bitmap encoding, base64 inside JSON by default "
+                            "or raw bytes (ex.?encoding=binary)",
+                required=False
+            )
+        ]
+    )
+    @action(detail=True, methods=["get"])
+    def seatmap(self, request, pk=None):
+        """
+        Taken places as a bitmap of rows * seats_in_row bits,
+        bit (row - 1) * seats_in_row + (seat - 1) is set for a taken seat
+        """
+        flight = self.get_object()
+
+        if request.query_params.get("encoding") == "binary":
+            response = HttpResponse(
+                flight.taken_places_bitmap(),
+                content_type="application/octet-stream"
+            )
+            response["X-Seatmap-Rows"] = flight.airplane.rows
+            response["X-Seatmap-Seats-In-Row"] = flight.airplane.seats_in_row
+            return response
+
+        serializer = self.get_serializer(flight)
+        return Response(serializer.data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type=int,
+                description="Source airport id (ex.?from=1)",
+                required=True
+            ),
+            OpenApiParameter(
+                "to",
+                type=int,
+                description="Destination airport id (ex.?to=2)",
+                required=True
+            ),
+            OpenApiParameter(
+                "date",
+                type=date,
+                description="Departure date (ex.?date=2023-08-09)",
+                required=True
+            ),
+            OpenApiParameter(
+                "max_legs",
+                type=int,
+                description="Maximum flights in itinerary, 1-4, "
+                            "default 2 (ex.?max_legs=3)",
+                required=False
+            ),
+            OpenApiParameter(
+                "order",
+                type=str,
+                enum=["duration", "distance"],
+                description="Rank by total duration (default) or distance "
+                            "(ex.?order=distance)",
+                required=False
+            ),
+            OpenApiParameter(
+                "limit",
+                type=int,
+                description="Maximum itineraries, 1-100, default 20 "
+                            "(ex.?limit=5)",
+                required=False
+            ),
+        ]
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def search(self, request):
+        """
+        Itineraries from one airport to another with up to max_legs
+        flights, each connection leaves at least 45 minutes to transfer
+        """
+        search = FlightSearchSerializer(
+            data={
+                field: request.query_params[param]
+                for param, field in [
+                    ("from", "source"),
+                    ("to", "destination"),
+                    ("date", "date"),
+                    ("max_legs", "max_legs"),
+                    ("order", "order"),
+                    ("limit", "limit"),
+                ]
+                if param in request.query_params
+            }
+        )
+        search.is_valid(raise_exception=True)
+        limit = search.validated_data.pop("limit")
+
+        itineraries = flight_search_index.search(**search.validated_data)
+        serializer = self.get_serializer(itineraries[:limit], many=True)
+        return Response(serializer.data)
@@ -0,0 +1,332 @@
+import base64
+import functools
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.http import HttpResponse, JsonResponse
+from django_filters.utils import translate_validation
+from rest_framework import exceptions
+from rest_framework.fields import DateTimeField
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken
+)
+from rest_framework_simplejwt.settings import (
+    api_settings as jwt_settings
+)
+
+from airport.models import Flight
+from api.authentication import CachedJWTAuthentication
+from api.filters.airport_filters import FlightFilter
+from api.pagination import estimate_count
+
+
+jwt_authentication = CachedJWTAuthentication()
+datetime_field = DateTimeField()
+
+
+async def authenticate(request):
+    """CachedJWTAuthentication with the user fetched through the async ORM"""
+    header = jwt_authentication.get_header(request)
+    raw_token = header and jwt_authentication.get_raw_token(header)
+    if raw_token is None:
+        raise exceptions.NotAuthenticated()
+
+    token = jwt_authentication.get_validated_token(raw_token)
+    try:
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken(
+            "Token contained no recognizable user identification"
+        )
+
+    user, version = jwt_authentication.cached_user(user_id)
+    if user is not None:
+        return user
+
+    try:
+        user = await get_user_model().objects.aget(
+            **{jwt_settings.USER_ID_FIELD: user_id}
+        )
+    except get_user_model().DoesNotExist:
+        raise AuthenticationFailed("User not found", code="user_not_found")
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    return jwt_authentication.cache_user(user_id, version, user)
+
+
+@sync_to_async
+def check_throttles(request, view):
+    """Same throttles as the sync views, they share their counters"""
+    for throttle_class in APIView.throttle_classes:
+        throttle = throttle_class()
+        if not throttle.allow_request(request, view):
+            raise exceptions.Throttled(throttle.wait())
+
+
+def async_api_view(view=None, throttle_scope=None, query_budget=None):
+    """
+    Gives a read-only async Django view the authentication, throttling
+    and error responses of the sync API, DRF views can't be async
+    """
+    if view is None:
+        return functools.partial(
+            async_api_view,
+            throttle_scope=throttle_scope,
+            query_budget=query_budget
+        )
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            if request.method not in ("GET", "HEAD"):
+                raise exceptions.MethodNotAllowed(request.method)
+            request.user = await authenticate(request)
+            await check_throttles(request, wrapper)
+            return await view(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            data = exc.detail
+            if not isinstance(data, (dict, list)):
+                data = {"detail": data}
+            response = JsonResponse(data, status=exc.status_code, safe=False)
+            if isinstance(
+                exc,
+                (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+            ):
+                response["WWW-Authenticate"] = (
+                    jwt_authentication.authenticate_header(request)
+                )
+            if getattr(exc, "wait", None) is not None:
+                response["Retry-After"] = str(int(exc.wait))
+            return response
+
+    wrapper.throttle_scope = throttle_scope
+    wrapper.query_budgets = {"get": query_budget}
+    return wrapper
+
+
+@sync_to_async
+def filter_flights(request, queryset):
+    filterset = FlightFilter(request.GET, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    return filterset.qs
+
+
+async def count_rows(queryset):
+    """
+    Count and whether it is exact, as EstimatedCountPaginator counts:
+    planner estimates of at least ESTIMATED_COUNT_THRESHOLD rows
+    """
+    estimate = await sync_to_async(estimate_count)(queryset)
+    if estimate is None or estimate < settings.ESTIMATED_COUNT_THRESHOLD:
+        return await queryset.acount(), True
+    return estimate, False
+
+
+def page_links(request, page, has_next):
+    url = request.build_absolute_uri()
+    next_link = previous_link = None
+    if has_next:
+        next_link = replace_query_param(url, "page", page + 1)
+    if page > 1:
+        previous_link = (
+            remove_query_param(url, "page")
+            if page == 2
+            else replace_query_param(url, "page", page - 1)
+        )
+    return next_link, previous_link
+
+
+@async_api_view(throttle_scope="search", query_budget=5)
+async def flight_list(request):
+    """Async twin of GET flights/ with the same filters and page numbers"""
+    queryset = await filter_flights(
+        request,
+        Flight.objects.annotate(
+            route_full_name=Concat(
+                F("route__source__name"),
+                Value("->"),
+                F("route__destination__name")
+            ),
+            available_tickets=(
+                F("airplane__seats_in_row") * F("airplane__rows")
+                - F("tickets_sold")
+            )
+        )
+    )
+
+    page_size = api_settings.PAGE_SIZE
+    count, count_exact = await count_rows(queryset)
+    pages = max((count + page_size - 1) // page_size, 1)
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 0
+    # pages past an estimated count are not refused
+    if page < 1 or (count_exact and page > pages):
+        raise exceptions.NotFound("Invalid page.")
+
+    flights = [
+        flight
+        async for flight in queryset[
+            (page - 1) * page_size:page * page_size
+        ].values(
+            "id",
+            "airplane__name",
+            "departure_time",
+            "arrival_time",
+            "route_full_name",
+            "available_tickets",
+        ).aiterator()
+    ]
+
+    crews = defaultdict(list)
+    async for crew in Flight.crews.through.objects.filter(
+        flight_id__in=[flight["id"] for flight in flights]
+    ).order_by(
+        "crew__first_name"
+    ).values(
+        "flight_id",
+        "crew__first_name",
+        "crew__last_name"
+    ).aiterator():
+        crews[crew["flight_id"]].append(
+            crew["crew__first_name"] + " " + crew["crew__last_name"]
+        )
+
+    next_link, previous_link = page_links(
+        request,
+        page,
+        # a short page is the last one whatever the estimate says
+        page < pages if count_exact else len(flights) == page_size
+    )
+    return JsonResponse(
+        {
+            "count": count,
+            "count_exact": count_exact,
+            "next": next_link,
+            "previous": previous_link,
+            "results": [
+                {
+                    "id": flight["id"],
+                    "airplane": flight["airplane__name"],
+                    "crews": crews[flight["id"]],
+                    "departure_time": datetime_field.to_representation(
+                        flight["departure_time"]
+                    ),
+                    "arrival_time": datetime_field.to_representation(
+                        flight["arrival_time"]
+                    ),
+                    "route_full_name": flight["route_full_name"],
+                    "available_tickets": flight["available_tickets"],
+                }
+                for flight in flights
+            ],
+        }
+    )
+
+
+async def get_flight(queryset, pk):
+    try:
+        return await queryset.aget(pk=pk)
+    except Flight.DoesNotExist:
+        raise exceptions.NotFound()
+
+
+def airport_data(airport):
+    return {
+        "id": airport.id,
+        "name": airport.name,
+        "closest_big_city": airport.closest_big_city,
+    }
+
+
+@async_api_view(query_budget=4)
+async def flight_detail(request, pk):
+    """Async twin of GET flights/<pk>/"""
+    flight = await get_flight(
+        Flight.objects.select_related(
+            "route__source",
+            "route__destination",
+            "airplane__airplane_type"
+        ),
+        pk
+    )
+    route, airplane = flight.route, flight.airplane
+
+    return JsonResponse(
+        {
+            "id": flight.id,
+            "route": {
+                "id": route.id,
+                "source": airport_data(route.source),
+                "destination": airport_data(route.destination),
+                "distance": route.distance,
+            },
+            "airplane": {
+                "id": airplane.id,
+                "name": airplane.name,
+                "rows": airplane.rows,
+                "seats_in_row": airplane.seats_in_row,
+                "airplane_type": {
+                    "id": airplane.airplane_type.id,
+                    "name": airplane.airplane_type.name,
+                },
+                "capacity": airplane.capacity,
+            },
+            "crews": [
+                crew
+                async for crew in flight.crews.values(
+                    "id",
+                    "first_name",
+                    "last_name"
+                ).aiterator()
+            ],
+            "departure_time": datetime_field.to_representation(
+                flight.departure_time
+            ),
+            "arrival_time": datetime_field.to_representation(
+                flight.arrival_time
+            ),
+            "taken_places": [
+                place
+                async for place in flight.tickets.values(
+                    "row",
+                    "seat"
+                ).aiterator()
+            ],
+        }
+    )
+
+
+@async_api_view(query_budget=3)
+async def flight_seatmap(request, pk):
+    """Async twin of GET flights/<pk>/seatmap/"""
+    flight = await get_flight(Flight.objects.select_related("airplane"), pk)
+    bitmap = await flight.ataken_places_bitmap()
+
+    if request.GET.get("encoding") == "binary":
+        response = HttpResponse(
+            bitmap,
+            content_type="application/octet-stream"
+        )
+        response["X-Seatmap-Rows"] = flight.airplane.rows
+        response["X-Seatmap-Seats-In-Row"] = flight.airplane.seats_in_row
+        return response
+
+    return JsonResponse(
+        {
+            "id": flight.id,
+            "rows": flight.airplane.rows,
+            "seats_in_row": flight.airplane.seats_in_row,
+            "taken_places": base64.b64encode(bitmap).decode(),
+        }
+    )
@@ -0,0 +1,15 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework import views
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from api import cache
+
+
+@extend_schema(tags=["Cache"])
+class CacheStatsView(views.APIView):
+    permission_classes = (IsAdminUser, )
+    query_budgets = {"get": 1}
+
+    def get(self, request):
+        return Response(cache.stats())
@@ -1,19 +1,36 @@
 from datetime import datetime
 
+from django.db.models import Count, Max, Prefetch, Sum
+from django.http import StreamingHttpResponse
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
 
-from cart.models import Order
+from airport.models import Airplane, Airport, Crew, Flight, Route
+from cart.models import Order, Ticket
 
+from api.cache import conditional, model_versions
+from api.export import CONTENT_TYPES, export_lines, export_rows
+from api.fieldsets import SparseFieldsetsMixin
+from api.pagination import (
+    CursorPaginationMixin,
+    EstimatedCountPagination,
+    OrderCursorPagination
+)
 from api.permissions import IsAdminOrIfAuthenticatedReadOnly
 from api.serializers.cart_serializers import (
+    ExportSerializer,
     OrderSerializer,
     OrderListSerializer
 )
+from api.views.airport_views import flight_list_queryset
 
 
 @extend_schema(tags=["Carts"])
 class OrderViewSet(
+    CursorPaginationMixin,
+    SparseFieldsetsMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet
@@ -21,13 +38,22 @@ class OrderViewSet(
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly, )
+    pagination_class = EstimatedCountPagination
+    cursor_pagination_class = OrderCursorPagination
+    query_budgets = {"list": 7, "create": 10, "export": 2}
+
+    def get_throttles(self):
+        if self.action == "create":
+            self.throttle_scope = "booking"
+        return super().get_throttles()
 
     def get_queryset(self):
         queryset = self.queryset.filter(
             user=self.request.user
         ).prefetch_related(
-            "tickets__flight__airplane",
-            "tickets__flight__crews"
+            # one query each for tickets and annotated flights
+            # however many tickets the page of orders has
+            Prefetch("tickets__flight", queryset=flight_list_queryset())
         )
 
         created_at = self.request.query_params.get("created_at")
@@ -44,6 +70,28 @@ class OrderViewSet(
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def get_etag_version(self, request):
+        """
+        One aggregate row: ticket ids only grow, so their count and max
+        id change with every booked or released ticket of the user, and
+        listed tickets show available places. tickets_version of a flight
+        only grows when its tickets_sold changes, so their sum grows with
+        any change on the flights of the user, unlike a sum of tickets_sold
+        """
+        tickets = Ticket.objects.filter(
+            order__user=request.user
+        ).aggregate(
+            count=Count("id"),
+            last=Max("id"),
+            sold=Sum("flight__tickets_version")
+        )
+        return (
+            model_versions((Flight, Route, Airport, Airplane, Crew)),
+            tickets["count"],
+            tickets["last"],
+            tickets["sold"]
+        )
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -52,8 +100,77 @@ class OrderViewSet(
                 description="Filter by created_at "
                             "(ex.?created_at=2023-08-09T13:34:44.670309Z)",
                 required=False
+            ),
+            OpenApiParameter(
+                "pagination",
+                type=str,
+                enum=["cursor"],
+                description="Paginate by (created_at, id) cursor "
+                            "instead of page number (ex.?pagination=cursor)",
+                required=False
             )
         ]
     )
+    @conditional
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "output",
+                type=str,
+                enum=["ndjson", "csv"],
+                description="Export file format, ndjson by default "
+                            "(ex.?output=csv)",
+                required=False
+            ),
+            OpenApiParameter(
+                "created_after",
+                type=datetime,
+                description="Orders created at or after "
+                            "(ex.?created_after=2023-08-01T00:00:00Z)",
+                required=False
+            ),
+            OpenApiParameter(
+                "created_before",
+                type=datetime,
+                description="Orders created before "
+                            "(ex.?created_before=2023-09-01T00:00:00Z)",
+                required=False
+            ),
+            OpenApiParameter(
+                "flights",
+                type={"type": "list", "items": {"type": "number"}},
+                description="Tickets of these flights only "
+                            "(ex.?flights=1&flights=2)",
+                required=False
+            ),
+        ],
+        responses={(200, "application/x-ndjson"): str}
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAdminUser],
+        pagination_class=None
+    )
+    def export(self, request):
+        """Every ticket with its order and flight, one line per ticket"""
+        params = ExportSerializer(
+            data={
+                **request.query_params.dict(),
+                "flights": request.query_params.getlist("flights"),
+            }
+        )
+        params.is_valid(raise_exception=True)
+        output = params.validated_data.pop("output")
+
+        response = StreamingHttpResponse(
+            export_lines(output, export_rows(**params.validated_data)),
+            content_type=CONTENT_TYPES[output]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tickets.{output}"'
+        )
+        return response
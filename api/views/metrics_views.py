@@ -0,0 +1,20 @@
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import views
+from rest_framework.permissions import IsAdminUser
+
+from api import metrics
+
+
+@extend_schema(exclude=True)
+class MetricsView(views.APIView):
+    """Prometheus scrape target, scrapes are not rate limited"""
+
+    permission_classes = (IsAdminUser, )
+    throttle_classes = ()
+
+    def get(self, request):
+        return HttpResponse(
+            metrics.render(metrics.store().collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
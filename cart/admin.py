@@ -1,7 +1,8 @@
 from django.contrib import admin
 
+from airport.admin import EstimatedCountAdmin
 from cart.models import Order, Ticket
 
 
-admin.site.register(Order)
-admin.site.register(Ticket)
+admin.site.register(Order, EstimatedCountAdmin)
+admin.site.register(Ticket, EstimatedCountAdmin)
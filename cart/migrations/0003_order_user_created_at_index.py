@@ -0,0 +1,19 @@
+# Generated by Django 4.2.4 on 2026-10-18 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cart", "0002_alter_order_options_alter_ticket_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="cart_order_user_id_cfeb96_idx",
+            ),
+        ),
+    ]
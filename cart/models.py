@@ -1,6 +1,11 @@
+import operator
+from collections import Counter
+from functools import reduce
+
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 
 from airport.models import Flight
 
@@ -18,6 +23,9 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["user"]
+        indexes = [
+            models.Index(fields=["user", "created_at", "id"]),
+        ]
 
 
 class Ticket(models.Model):
@@ -52,6 +60,23 @@ class Ticket(models.Model):
                     }
                 )
 
+    @staticmethod
+    def taken_places(places):
+        """Which of the (flight_id, row, seat) places already have tickets"""
+        if not places:
+            return set()
+        return set(
+            Ticket.objects.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(flight_id=flight_id, row=row, seat=seat)
+                        for flight_id, row, seat in places
+                    )
+                )
+            ).order_by().values_list("flight_id", "row", "seat")
+        )
+
     def clean(self):
         Ticket.validate_ticket(
             self.row,
@@ -68,7 +93,15 @@ class Ticket(models.Model):
             update_fields=None,
     ):
         self.full_clean()
-        return super().save()
+        sold = Counter({self.flight_id: 1})
+        if not self._state.adding:
+            # a ticket moved to another flight leaves the stored one
+            for flight_id in Ticket.objects.filter(
+                pk=self.pk
+            ).values_list("flight_id", flat=True):
+                sold[flight_id] -= 1
+        super().save()
+        Flight.update_tickets_sold(sold)
 
     class Meta:
         unique_together = ["flight", "row", "seat"]
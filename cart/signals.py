@@ -0,0 +1,18 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from airport.models import Airplane, AirplaneType, Airport, Flight, Route
+from cart.models import Ticket
+
+
+# deleting these cascades to the flights, whose counters go with them
+FLIGHT_DELETES = (Flight, Route, Airport, Airplane, AirplaneType)
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket(sender, instance, origin=None, **kwargs):
+    origin = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if issubclass(origin, FLIGHT_DELETES):
+        return
+    Flight.update_tickets_sold({instance.flight_id: -1})